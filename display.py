@@ -28,7 +28,12 @@ def get_point_of_element_by_dof(static_system, dof):
     else:
         p = element.p_i
 
-    return f"x={p[0]} z={p[1]}"
+    return f"x={format_coordinate(p[0])} z={format_coordinate(p[1])}"
+
+
+def format_coordinate(c):
+    # Coordinates are stored as floats, whole numbers are shown without decimals
+    return int(c) if float(c).is_integer() else float(c)
 
 
 class Display:
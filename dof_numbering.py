@@ -0,0 +1,217 @@
+import numpy as np
+from scipy.sparse import csr_matrix, identity
+
+
+class DofNumbering:
+
+    def __init__(
+        self,
+        nelements,
+        restrained_dofs,
+        boundary_conditions,
+        multipoint_constraints=None,
+    ):
+        ndofs = 6 * nelements
+
+        self.dofs = np.arange(1, ndofs + 1)
+
+        # A boundary condition is a constraint with a single term
+        constraints = {
+            dof: ((times, is_equal_to_dof),)
+            for dof, (times, is_equal_to_dof) in boundary_conditions.items()
+        }
+        constraints.update(multipoint_constraints or {})
+
+        constrained_dofs = np.array(
+            [dof for dof in constraints.keys() if 0 < dof <= ndofs], dtype=int
+        )
+
+        is_essential = np.ones(ndofs, dtype=bool)
+        is_essential[constrained_dofs - 1] = False
+
+        self.essential_dofs = self.dofs[is_essential]
+
+        terms = [
+            (dof, factor, master)
+            for dof in constrained_dofs
+            for factor, master in constraints[dof]
+            if 0 < master <= ndofs
+        ]
+        rows, factors, masters = np.array(terms, dtype=float).reshape(-1, 3).T
+
+        self.transformation = get_transformation(
+            ndofs,
+            self.essential_dofs,
+            constrained_dofs,
+            rows.astype(int),
+            masters.astype(int),
+            factors,
+        )
+        self.dof_indices = get_dof_indices(self.transformation)
+
+        self.init_restraints(ndofs, restrained_dofs, nelements)
+
+    def init_restraints(self, ndofs, restrained_dofs, nelements):
+        is_restrained = np.zeros(ndofs + 1, dtype=bool)
+        is_restrained[[dof for dof in restrained_dofs if 0 < dof <= ndofs]] = True
+
+        self.restrained_dofs = self.dofs[is_restrained[1:]]
+        self.non_restrained_dofs = self.dofs[~is_restrained[1:]]
+
+        self.essential_restrained_dofs = self.essential_dofs[
+            is_restrained[self.essential_dofs]
+        ]
+        self.essential_non_restrained_dofs = self.essential_dofs[
+            ~is_restrained[self.essential_dofs]
+        ]
+
+        # Essential DoFs which are the target of a restrained DoF, i.e. the
+        # column of its row in T if it depends on a single essential DoF
+        rows = self.transformation[self.restrained_dofs - 1]
+        is_single = np.diff(rows.indptr) == 1
+
+        self.restrained_mask = np.zeros(len(self.essential_dofs), dtype=bool)
+        self.restrained_mask[rows.indices[rows.indptr[:-1][is_single]]] = True
+        self.non_restrained_mask = ~self.restrained_mask
+
+        self.element_indices = self.dof_indices[1:].reshape(nelements, 6)
+
+        # Every element DoF is a single essential DoF times 1, the element
+        # indices are sufficient to gather and scatter
+        self.is_selection = bool(
+            np.all(np.diff(self.transformation.indptr) == 1)
+            and np.all(self.transformation.data == 1)
+        )
+
+        for array in vars(self).values():
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+
+    def get_ndofs(self):
+        return len(self.essential_dofs)
+
+    def get_index(self, dof):
+        index = self.dof_indices[dof] if 0 < dof < len(self.dof_indices) else -1
+
+        if index < 0:
+            raise DoFHasNoEssentialIndex(dof)
+
+        return index
+
+    def get_indices(self, dofs):
+        dofs = np.asarray(dofs, dtype=int)
+
+        if dofs.size == 0:
+            return np.zeros(0, dtype=int)
+
+        if dofs.min() < 1 or dofs.max() >= len(self.dof_indices):
+            raise DoFHasNoEssentialIndex(dofs)
+
+        indices = self.dof_indices[dofs]
+
+        if indices.min() < 0:
+            raise DoFHasNoEssentialIndex(dofs[indices < 0])
+
+        return indices
+
+
+def get_transformation(ndofs, essential_dofs, constrained_dofs, rows, masters, factors):
+    # u = T u_essential, the rows of constrained DoFs are the sums of the rows of
+    # their masters times the factors, chains of constraints are resolved by
+    # repeated substitution, DoFs which cannot be resolved get zero rows
+    is_constrained = np.zeros(ndofs, dtype=bool)
+    is_constrained[constrained_dofs - 1] = True
+
+    substitution = csr_matrix(
+        (factors, (rows - 1, masters - 1)), shape=(ndofs, ndofs)
+    ) + identity(ndofs, format="csr").multiply(~is_constrained[:, None])
+
+    transformation = substitution.tocsr()
+
+    for _ in range(len(constrained_dofs)):
+        if transformation[:, is_constrained].nnz == 0:
+            break
+
+        transformation = (substitution @ transformation).tocsr()
+
+    transformation = transformation[:, essential_dofs - 1].tocsr()
+    transformation.eliminate_zeros()
+
+    return transformation
+
+
+def get_dof_indices(transformation):
+    # Lookup table indexed by the DoF number itself, entry 0 is unused. DoFs
+    # which are equal to a single essential DoF, i.e. one entry of 1 in their
+    # row, have its index, others have -1
+    indices = np.full(transformation.shape[0] + 1, -1)
+
+    is_single = np.diff(transformation.indptr) == 1
+    first = transformation.indptr[:-1][is_single]
+    is_single[is_single] = transformation.data[first] == 1
+
+    indices[1:][is_single] = transformation.indices[
+        transformation.indptr[:-1][is_single]
+    ]
+
+    return indices
+
+
+class NodeDofNumbering(DofNumbering):
+
+    # Numbering by physical nodes instead of boundary conditions: every node
+    # gets x, z and, if an element is connected stiffly, phi, every hinged
+    # element end gets a rotation of its own. The element DoF with the lowest
+    # number represents the index it is mapped to.
+
+    def __init__(self, element_nodes, hinged_ends, restrained_dofs):
+        element_nodes = np.asarray(element_nodes, dtype=int).reshape(-1, 2)
+        hinged_ends = np.asarray(hinged_ends, dtype=bool).reshape(-1, 2)
+
+        nelements = len(element_nodes)
+        ndofs = 6 * nelements
+
+        self.dofs = np.arange(1, ndofs + 1)
+
+        ends = element_nodes.ravel()
+        is_hinged = hinged_ends.ravel()
+        _, nodes = np.unique(ends, return_inverse=True)
+        nodes = nodes.ravel()
+        nnodes = nodes.max(initial=-1) + 1
+
+        has_phi = np.zeros(nnodes, dtype=bool)
+        has_phi[nodes[~is_hinged]] = True
+        nhinges = np.bincount(nodes[is_hinged], minlength=nnodes)
+
+        offsets = np.concatenate([[0], np.cumsum(2 + has_phi + nhinges)])
+
+        # Rank of every hinged end among the hinged ends of its node
+        hinged_nodes = nodes[is_hinged]
+        order = np.argsort(hinged_nodes, kind="stable")
+        ranks = np.empty(len(order), dtype=int)
+        ranks[order] = np.arange(len(order)) - np.searchsorted(
+            hinged_nodes[order], hinged_nodes[order]
+        )
+
+        phi = offsets[nodes] + 2
+        phi[is_hinged] += has_phi[hinged_nodes] + ranks
+
+        end_indices = np.stack(
+            [offsets[nodes], offsets[nodes] + 1, phi], axis=1
+        ).reshape(-1)
+
+        self.dof_indices = np.concatenate([[-1], end_indices])
+
+        self.essential_dofs = np.full(offsets[-1], ndofs + 1)
+        np.minimum.at(self.essential_dofs, end_indices, self.dofs)
+
+        self.transformation = csr_matrix(
+            (np.ones(ndofs), (np.arange(ndofs), end_indices)),
+            shape=(ndofs, offsets[-1]),
+        )
+
+        self.init_restraints(ndofs, restrained_dofs, nelements)
+
+
+class DoFHasNoEssentialIndex(ValueError):
+    pass
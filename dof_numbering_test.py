@@ -0,0 +1,168 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+from dof_numbering import DofNumbering, DoFHasNoEssentialIndex, NodeDofNumbering
+from example_static_systems import (
+    create_bernoulli_beam,
+    create_frame,
+    create_rhein_bruecke,
+)
+from static_system import NodeNumberingDoesNotMatchTopology
+from static_system_solver import StaticSystemSolver
+from vector import vector
+
+
+class TestDofNumbering(unittest.TestCase):
+
+    def test_essential_dofs(self):
+        dof_numbering = create_bernoulli_beam().get_dof_numbering()
+
+        assert_array_equal(
+            dof_numbering.essential_dofs, vector(1, 2, 3, 4, 5, 6, 10, 11, 12)
+        )
+        self.assertEqual(dof_numbering.get_ndofs(), 9)
+
+    def test_get_index(self):
+        dof_numbering = create_bernoulli_beam().get_dof_numbering()
+
+        self.assertEqual(dof_numbering.get_index(4), 3)
+        self.assertEqual(dof_numbering.get_index(7), 3)
+        self.assertEqual(dof_numbering.get_index(10), 6)
+
+        with self.assertRaises(DoFHasNoEssentialIndex):
+            dof_numbering.get_index(13)
+
+    def test_get_indices(self):
+        dof_numbering = create_bernoulli_beam().get_dof_numbering()
+
+        assert_array_equal(dof_numbering.get_indices([9, 1, 12]), vector(5, 0, 8))
+        assert_array_equal(dof_numbering.get_indices([]), vector())
+
+    def test_restrained_and_non_restrained_masks(self):
+        dof_numbering = create_bernoulli_beam().get_dof_numbering()
+
+        restrained_mask = np.zeros(9, dtype=bool)
+        restrained_mask[[0, 1, 7]] = True
+
+        assert_array_equal(dof_numbering.restrained_mask, restrained_mask)
+        assert_array_equal(dof_numbering.non_restrained_mask, ~restrained_mask)
+
+    def test_element_indices(self):
+        dof_numbering = create_frame().get_dof_numbering()
+
+        assert_array_equal(
+            dof_numbering.element_indices,
+            np.array(
+                [
+                    [0, 1, 2, 3, 4, 5],
+                    [3, 4, 5, 6, 7, 8],
+                    [6, 7, 9, 10, 11, 12],
+                ]
+            ),
+        )
+
+    def test_boundary_condition_to_missing_dof_has_no_index(self):
+        dof_numbering = DofNumbering(
+            nelements=1, restrained_dofs={1}, boundary_conditions={4: (1, 7)}
+        )
+
+        assert_array_equal(dof_numbering.essential_dofs, vector(1, 2, 3, 5, 6))
+
+        with self.assertRaises(DoFHasNoEssentialIndex):
+            dof_numbering.get_index(4)
+
+    def test_boundary_condition_with_factor_has_no_index(self):
+        dof_numbering = DofNumbering(
+            nelements=2,
+            restrained_dofs={7},
+            boundary_conditions={7: (-1, 4), 8: (2, 5)},
+        )
+
+        with self.assertRaises(DoFHasNoEssentialIndex):
+            dof_numbering.get_indices([7, 8])
+
+        self.assertEqual(dof_numbering.element_indices[1, 1], -1)
+        self.assertFalse(dof_numbering.is_selection)
+
+        # The master of a restrained DoF is restrained regardless of the factor
+        self.assertTrue(dof_numbering.restrained_mask[dof_numbering.get_index(4)])
+
+    def test_dof_numbering_is_rebuilt_only_on_topology_changes(self):
+        static_system = create_bernoulli_beam()
+        dof_numbering = static_system.get_dof_numbering()
+
+        static_system.update_element(
+            id=1, p_i=vector(0, 0), p_k=vector(1, 0), EA=2, EI=2
+        )
+        self.assertIs(static_system.get_dof_numbering(), dof_numbering)
+
+        static_system.set_restrained_dof(12)
+        self.assertIsNot(static_system.get_dof_numbering(), dof_numbering)
+        self.assertTrue(static_system.get_dof_numbering().restrained_mask[-1])
+
+
+class TestNodeDofNumbering(unittest.TestCase):
+
+    def test_element_indices(self):
+        # The frame with a hinge at the i end of element 3
+        dof_numbering = NodeDofNumbering(
+            element_nodes=[(1, 2), (2, 3), (3, 4)],
+            hinged_ends=[(False, False), (False, False), (True, False)],
+            restrained_dofs={1, 2, 16, 17},
+        )
+
+        assert_array_equal(
+            dof_numbering.element_indices,
+            create_frame().get_dof_numbering().element_indices,
+        )
+        assert_array_equal(
+            dof_numbering.essential_dofs,
+            vector(1, 2, 3, 4, 5, 6, 10, 11, 12, 15, 16, 17, 18),
+        )
+        assert_array_equal(
+            dof_numbering.restrained_mask,
+            create_frame().get_dof_numbering().restrained_mask,
+        )
+
+    def test_node_with_hinged_ends_only(self):
+        dof_numbering = NodeDofNumbering(
+            element_nodes=[(1, 2), (2, 3)],
+            hinged_ends=[(False, True), (True, False)],
+            restrained_dofs=set(),
+        )
+
+        self.assertEqual(dof_numbering.get_ndofs(), 10)
+        assert_array_equal(
+            dof_numbering.element_indices,
+            np.array([[0, 1, 2, 3, 4, 5], [3, 4, 6, 7, 8, 9]]),
+        )
+
+    def test_results_match_the_numbering_by_boundary_conditions(self):
+        static_system = create_rhein_bruecke()
+        node_static_system = create_rhein_bruecke(node_numbering=True)
+
+        solver = StaticSystemSolver(static_system)
+        node_solver = StaticSystemSolver(node_static_system)
+
+        self.assertEqual(node_static_system.boundary_conditions, {})
+        self.assertEqual(node_solver.get_ndofs(), solver.get_ndofs())
+
+        assert_allclose(
+            node_solver.get_displacements()[node_solver.get_element_indices()],
+            solver.get_displacements()[solver.get_element_indices()],
+            atol=1e-12,
+        )
+        for id in range(1, len(static_system.get_elements()) + 1):
+            assert_allclose(
+                node_solver.get_internal_forces_of_element(id),
+                solver.get_internal_forces_of_element(id),
+                atol=1e-10,
+            )
+
+    def test_topology_is_fixed_by_the_node_numbering(self):
+        static_system = create_rhein_bruecke(node_numbering=True)
+
+        with self.assertRaises(NodeNumberingDoesNotMatchTopology):
+            static_system.delete_element(1)
@@ -1,12 +1,62 @@
 import math
 import numpy as np
 
+from element_table import COLUMN_INDICES, ElementTable
 from utilities import get_k_global, get_rotation_matrix, get_rotation_matrix_of_element
 from vector import vector
 
 
+def column_property(name):
+    j = COLUMN_INDICES[name]
+
+    def getter(self):
+        return self.table.data[j, self.row]
+
+    def setter(self, value):
+        self.table.data[j, self.row] = value
+        self.table.mark_changed()
+
+    return property(getter, setter)
+
+
+def point_property(name):
+    j = COLUMN_INDICES[f"x_{name}"]
+
+    def getter(self):
+        # A copy, views of the table are stale once it is reallocated and
+        # changes have to go through the setter
+        return self.table.data[j : j + 2, self.row].copy()
+
+    def setter(self, value):
+        self.table.data[j : j + 2, self.row] = value
+        self.table.mark_changed(topology=True)
+
+    return property(getter, setter)
+
+
 class Element:
 
+    # An element is a view on one row of an element table, a standalone element
+    # owns a table with a single row until it is attached to a static system
+    __slots__ = ("id", "table", "row")
+
+    p_i = point_property("i")
+    p_k = point_property("k")
+
+    EA = column_property("EA")
+    EI = column_property("EI")
+
+    q_x = column_property("q_x")
+    q_z = column_property("q_z")
+
+    f_x_i = column_property("f_x_i")
+    f_z_i = column_property("f_z_i")
+    m_y_i = column_property("m_y_i")
+
+    f_x_k = column_property("f_x_k")
+    f_z_k = column_property("f_z_k")
+    m_y_k = column_property("m_y_k")
+
     def __init__(self, p_i, p_k, EA=1, EI=1):
 
         if np.array_equal(p_i, p_k):
@@ -20,22 +70,40 @@ class Element:
 
         self.id = id
 
+        self.table = ElementTable(capacity=1)
+        self.table.insert_row(0, 0)
+        self.row = 0
+
         self.p_i = p_i
         self.p_k = p_k
 
         self.EA = EA
         self.EI = EI
 
-        self.q_x = 0
-        self.q_z = 0
+    def set_values(self, **values):
+        # Writes the values without marking the table as changed
+        for name, value in values.items():
+            if name in ("p_i", "p_k"):
+                j = COLUMN_INDICES[f"x_{name[-1]}"]
+                self.table.data[j : j + 2, self.row] = value
+            else:
+                self.table.data[COLUMN_INDICES[name], self.row] = value
+
+    def get_values(self):
+        return self.table.data[:, self.row].copy()
+
+    def attach(self, table, row):
+        table.insert_row(row, self.table.data[:, self.row])
+
+        self.table = table
+        self.row = row
 
-        self.f_x_i = 0
-        self.f_z_i = 0
-        self.m_y_i = 0
+    def detach(self):
+        values = self.table.delete_row(self.row)
 
-        self.f_x_k = 0
-        self.f_z_k = 0
-        self.m_y_k = 0
+        self.table = ElementTable(capacity=1)
+        self.table.insert_row(0, values)
+        self.row = 0
 
     def get_length(self):
         return np.linalg.norm(self.get_element_vector())
@@ -0,0 +1,93 @@
+import numpy as np
+
+ELEMENT_COLUMNS = (
+    "x_i",
+    "z_i",
+    "x_k",
+    "z_k",
+    "EA",
+    "EI",
+    "q_x",
+    "q_z",
+    "f_x_i",
+    "f_z_i",
+    "m_y_i",
+    "f_x_k",
+    "f_z_k",
+    "m_y_k",
+)
+
+COLUMN_INDICES = {name: j for j, name in enumerate(ELEMENT_COLUMNS)}
+
+
+class ElementTable:
+
+    def __init__(self, capacity=16, owner=None):
+        self.size = 0
+
+        # Static system whose revisions are incremented when values change
+        self.owner = owner
+
+        # One contiguous row per property, the elements are the columns
+        self.data = np.zeros((len(ELEMENT_COLUMNS), max(capacity, 1)))
+
+    def __len__(self):
+        return self.size
+
+    def mark_changed(self, topology=False):
+        if self.owner is None:
+            return
+
+        self.owner.revision += 1
+
+        if topology:
+            self.owner.topology_revision += 1
+
+    def get_capacity(self):
+        return self.data.shape[1]
+
+    def get_column(self, name):
+        return self.data[COLUMN_INDICES[name], : self.size]
+
+    def get_p_i(self):
+        return self.data[0:2, : self.size].T
+
+    def get_p_k(self):
+        return self.data[2:4, : self.size].T
+
+    def get_columns(self):
+        columns = {name: self.get_column(name) for name in ELEMENT_COLUMNS[4:]}
+
+        columns["p_i"] = self.get_p_i()
+        columns["p_k"] = self.get_p_k()
+
+        return columns
+
+    def insert_row(self, index, values):
+        if not 0 <= index <= self.size:
+            raise RowIndexOutOfRange(index)
+
+        if self.size == self.get_capacity():
+            data = np.zeros((len(ELEMENT_COLUMNS), 2 * self.get_capacity()))
+            data[:, : self.size] = self.data[:, : self.size]
+            self.data = data
+
+        self.data[:, index + 1 : self.size + 1] = self.data[:, index : self.size]
+        self.data[:, index] = values
+        self.size += 1
+
+    def delete_row(self, index):
+        if not 0 <= index < self.size:
+            raise RowIndexOutOfRange(index)
+
+        values = self.data[:, index].copy()
+
+        self.data[:, index : self.size - 1] = self.data[:, index + 1 : self.size]
+        self.data[:, self.size - 1] = 0
+        self.size -= 1
+
+        return values
+
+
+class RowIndexOutOfRange(IndexError):
+    pass
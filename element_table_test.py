@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from element_table import ELEMENT_COLUMNS, ElementTable, RowIndexOutOfRange
+from vector import vector
+
+
+def create_row(value):
+    return np.full(len(ELEMENT_COLUMNS), value, dtype=float)
+
+
+class TestElementTable(unittest.TestCase):
+
+    def test_insert_row(self):
+        table = ElementTable(capacity=1)
+
+        table.insert_row(0, create_row(1))
+        table.insert_row(1, create_row(3))
+        table.insert_row(1, create_row(2))
+
+        self.assertEqual(len(table), 3)
+        self.assertGreaterEqual(table.get_capacity(), 3)
+        assert_array_equal(table.get_column("EA"), vector(1, 2, 3))
+        assert_array_equal(table.get_p_k(), np.array([[1, 1], [2, 2], [3, 3]]))
+
+    def test_delete_row(self):
+        table = ElementTable()
+
+        for i in range(3):
+            table.insert_row(i, create_row(i))
+
+        assert_array_equal(table.delete_row(1), create_row(1))
+        assert_array_equal(table.get_column("q_z"), vector(0, 2))
+
+        with self.assertRaises(RowIndexOutOfRange):
+            table.delete_row(2)
+
+    def test_columns_are_views(self):
+        table = ElementTable()
+        table.insert_row(0, create_row(1))
+
+        columns = table.get_columns()
+        columns["EI"][0] = 5
+        columns["p_i"][0, 1] = 7
+
+        self.assertEqual(table.get_column("EI")[0], 5)
+        self.assertEqual(table.get_column("z_i")[0], 7)
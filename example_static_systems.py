@@ -206,6 +206,7 @@ def create_rhein_bruecke(
     EA_seil=1000,
     EI_seil=1,
     q_z_fahrbahn=1,
+    node_numbering=False,
 ):
     nodes = [
         {
@@ -693,4 +694,6 @@ def create_rhein_bruecke(
         },
     ]
 
-    return StaticSystem.from_node_and_element_tables(nodes, elements)
+    return StaticSystem.from_node_and_element_tables(
+        nodes, elements, node_numbering=node_numbering
+    )
@@ -0,0 +1,171 @@
+import numpy as np
+from scipy.sparse import csc_matrix, identity
+from scipy.sparse.linalg import splu
+
+
+class Factorization:
+
+    # Pivots below this fraction of the largest diagonal entry of K are
+    # treated as zero, the system is then kinematic
+    PIVOT_TOLERANCE = 1e-12
+
+    # Shift of the diagonal which makes a singular K factorizable, the
+    # mechanism mode is found by inverse iteration with this factorization
+    SINGULAR_SHIFT = 1e-10
+
+    def __init__(self, k):
+        self.shape = k.shape
+        self.singular = False
+        self.mechanism_mode = None
+
+        if self.shape[0] == 0:
+            self.lu = None
+            return
+
+        k = csc_matrix(k, dtype=float)
+        scale = np.max(np.abs(k.diagonal())) or 1
+
+        try:
+            self.lu = self.factorize(k)
+            self.singular = bool(
+                np.any(np.abs(self.get_pivots()) <= self.PIVOT_TOLERANCE * scale)
+            )
+        except RuntimeError:
+            # SuperLU stops at a pivot which is exactly zero
+            self.singular = True
+            self.lu = self.factorize(
+                k + self.SINGULAR_SHIFT * scale * identity(self.shape[0])
+            )
+
+    def factorize(self, k):
+        # The stiffness matrix is symmetric, so the pivots are taken from the
+        # diagonal and the fill reducing ordering is computed on K + K^T which
+        # makes the LU decomposition equivalent to a LDL^T decomposition
+        return splu(
+            csc_matrix(k),
+            permc_spec="MMD_AT_PLUS_A",
+            diag_pivot_thresh=0,
+            options=dict(SymmetricMode=True),
+        )
+
+    def get_pivots(self):
+        if self.lu is None:
+            return np.zeros(0)
+
+        return self.lu.U.diagonal()
+
+    def is_singular(self):
+        return self.singular
+
+    def get_mechanism_mode(self):
+        # Null space vector of K by inverse iteration, scaled to a largest
+        # entry of 1
+        if not self.is_singular():
+            return None
+
+        if self.mechanism_mode is None:
+            x = np.random.default_rng(0).standard_normal(self.get_ndofs())
+
+            for _ in range(3):
+                x = self.lu.solve(x)
+                x /= np.max(np.abs(x))
+
+            self.mechanism_mode = x * np.sign(x[np.argmax(np.abs(x))])
+
+        return self.mechanism_mode
+
+    def get_ndofs(self):
+        return self.shape[0]
+
+    def solve(self, rhs):
+        return self._solve(rhs, trans="N")
+
+    def solve_transposed(self, rhs):
+        return self._solve(rhs, trans="T")
+
+    def _solve(self, rhs, trans):
+        rhs = np.asarray(rhs, dtype=float)
+
+        if rhs.shape[0] != self.get_ndofs():
+            raise RightHandSideDoesNotMatchFactorization()
+
+        if self.lu is None:
+            return np.zeros_like(rhs)
+
+        if self.singular:
+            raise SystemIsKinematic()
+
+        return self.lu.solve(rhs, trans=trans)
+
+
+class UpdatedFactorization:
+
+    # Solves (A + U D U^T) x = b with the factorization of A, U selects the
+    # rows in indices (Sherman-Morrison-Woodbury identity):
+    #   x = y - Z (I + D Z[indices])^-1 D y[indices], y = A^-1 b, Z = A^-1 U
+
+    def __init__(self, factorization, indices, d):
+        self.factorization = factorization
+        self.shape = factorization.shape
+
+        self.indices = np.asarray(indices, dtype=int)
+        self.d = np.asarray(d, dtype=float)
+
+        self.z = {}
+        self.capacitance = {}
+
+    def get_ndofs(self):
+        return self.shape[0]
+
+    def get_rank(self):
+        return len(self.indices)
+
+    def get_capacitance(self, trans):
+        if trans not in self.capacitance:
+            u = np.zeros((self.get_ndofs(), self.get_rank()))
+            u[self.indices, np.arange(self.get_rank())] = 1
+
+            d = self.d if trans == "N" else self.d.T
+
+            self.z[trans] = self.factorization._solve(u, trans=trans)
+            self.capacitance[trans] = (
+                np.eye(self.get_rank()) + d @ self.z[trans][self.indices]
+            )
+
+        return self.capacitance[trans]
+
+    def is_singular(self):
+        # Updates with an ill conditioned capacitance matrix are rejected by the
+        # solver, so only the factorization itself can be singular
+        return self.factorization.is_singular()
+
+    def get_mechanism_mode(self):
+        return self.factorization.get_mechanism_mode()
+
+    def get_condition_number(self):
+        return np.linalg.cond(self.get_capacitance("N"))
+
+    def solve(self, rhs):
+        return self._solve(rhs, trans="N")
+
+    def solve_transposed(self, rhs):
+        return self._solve(rhs, trans="T")
+
+    def _solve(self, rhs, trans):
+        y = self.factorization._solve(rhs, trans=trans)
+
+        if self.get_rank() == 0:
+            return y
+
+        capacitance = self.get_capacitance(trans)
+        d = self.d if trans == "N" else self.d.T
+
+        return y - self.z[trans] @ np.linalg.solve(capacitance, d @ y[self.indices])
+
+
+class RightHandSideDoesNotMatchFactorization(Exception):
+    pass
+
+
+class SystemIsKinematic(Exception):
+    pass
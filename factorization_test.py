@@ -0,0 +1,126 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.sparse import csr_matrix
+
+from example_static_systems import create_frame
+from factorization import (
+    Factorization,
+    RightHandSideDoesNotMatchFactorization,
+    SystemIsKinematic,
+    UpdatedFactorization,
+)
+from static_system_solver import StaticSystemSolver
+
+
+class TestFactorization(unittest.TestCase):
+
+    def test_solve(self):
+        k = np.array(
+            [
+                [4, 1, 0],
+                [1, 3, 1],
+                [0, 1, 2],
+            ]
+        )
+        f = np.array([1, 2, 3])
+
+        factorization = Factorization(csr_matrix(k))
+
+        assert_allclose(factorization.solve(f), np.linalg.solve(k, f))
+
+    def test_solve_transposed(self):
+        k = np.array(
+            [
+                [4, 1, 0],
+                [2, 3, 1],
+                [0, 1, 2],
+            ]
+        )
+        f = np.array([1, 2, 3])
+
+        factorization = Factorization(csr_matrix(k))
+
+        assert_allclose(factorization.solve_transposed(f), np.linalg.solve(k.T, f))
+
+    def test_solve_multiple_right_hand_sides(self):
+        solver = StaticSystemSolver(create_frame())
+        k = solver.get_non_restrained_k()
+        f = np.arange(2 * len(k)).reshape(len(k), 2)
+
+        factorization = solver.get_factorization()
+
+        assert_allclose(factorization.solve(f), np.linalg.solve(k, f))
+
+    def test_solve_without_dofs(self):
+        factorization = Factorization(csr_matrix((0, 0)))
+
+        self.assertEqual(np.shape(factorization.solve(np.zeros(0))), (0,))
+
+    def test_right_hand_side_must_match_factorization(self):
+        factorization = Factorization(csr_matrix(np.eye(3)))
+
+        with self.assertRaises(RightHandSideDoesNotMatchFactorization):
+            factorization.solve(np.zeros(4))
+
+    def test_singular_matrix(self):
+        # Two springs in series without a support
+        k = np.array(
+            [
+                [1, -1, 0],
+                [-1, 2, -1],
+                [0, -1, 1],
+            ],
+            dtype=float,
+        )
+
+        factorization = Factorization(csr_matrix(k))
+
+        self.assertTrue(factorization.is_singular())
+        assert_allclose(factorization.get_mechanism_mode(), [1, 1, 1])
+
+        with self.assertRaises(SystemIsKinematic):
+            factorization.solve(np.ones(3))
+
+    def test_nearly_singular_matrix(self):
+        k = np.array([[1, 1], [1, 1 + 1e-14]])
+
+        factorization = Factorization(csr_matrix(k))
+
+        self.assertTrue(factorization.is_singular())
+        assert_allclose(k @ factorization.get_mechanism_mode(), 0, atol=1e-12)
+
+    def test_regular_matrix_has_no_mechanism_mode(self):
+        factorization = Factorization(csr_matrix(np.diag([1e-3, 1, 1e3])))
+
+        self.assertFalse(factorization.is_singular())
+        self.assertIsNone(factorization.get_mechanism_mode())
+
+    def test_updated_factorization(self):
+        a = np.array(
+            [
+                [4, 1, 0, 0],
+                [1, 3, 1, 0],
+                [0, 1, 2, 1],
+                [0, 0, 1, 5],
+            ],
+            dtype=float,
+        )
+        d = np.array([[2, -1], [-1, 2]], dtype=float)
+        indices = [1, 3]
+
+        updated_a = a.copy()
+        updated_a[np.ix_(indices, indices)] += d
+
+        factorization = UpdatedFactorization(
+            Factorization(csr_matrix(a)), indices=indices, d=d
+        )
+        rhs = np.array([[1, 0], [2, 1], [3, 0], [4, 1]], dtype=float)
+
+        self.assertEqual(factorization.get_rank(), 2)
+        assert_allclose(factorization.solve(rhs), np.linalg.solve(updated_a, rhs))
+        assert_allclose(
+            factorization.solve_transposed(rhs[:, 0]),
+            np.linalg.solve(updated_a.T, rhs[:, 0]),
+        )
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy.sparse import coo_matrix
 
 
 def delete_rows_and_columns_from_matrix(m, indices_to_delete):
@@ -12,3 +13,57 @@ def delete_rows_from_matrix(m, indices_to_delete):
 
 def delete_columns_from_matrix(m, indices_to_delete):
     return np.delete(m, indices_to_delete, axis=1)
+
+
+def assemble_sparse_matrix(element_matrices, element_indices, n):
+    element_indices = np.asarray(element_indices, dtype=int)
+    m = element_indices.shape[-1] if element_indices.size else 6
+
+    element_matrices = np.asarray(element_matrices, dtype=float).reshape(-1, m, m)
+    element_indices = element_indices.reshape(-1, m)
+
+    # Every entry (i, j) of an element matrix is scattered into the slot
+    # (indices[i], indices[j]), duplicates are summed up by the conversion to CSR
+    rows = np.repeat(element_indices, m, axis=1)
+    columns = np.tile(element_indices, (1, m))
+
+    return coo_matrix(
+        (element_matrices.ravel(), (rows.ravel(), columns.ravel())), shape=(n, n)
+    ).tocsr()
+
+
+def assemble_vector(element_vectors, element_indices, n):
+    element_indices = np.asarray(element_indices, dtype=int)
+
+    return np.bincount(
+        element_indices.ravel(),
+        weights=np.asarray(element_vectors, dtype=float).ravel(),
+        minlength=n,
+    )
+
+
+def assemble_vectors(element_vectors, element_indices, n):
+    element_indices = np.asarray(element_indices, dtype=int).ravel()
+    element_vectors = np.asarray(element_vectors, dtype=float)
+    nvectors = len(element_vectors)
+
+    # Every vector becomes a column of the assembled (n, L) matrix
+    columns = np.repeat(np.arange(nvectors), len(element_indices))
+
+    return coo_matrix(
+        (
+            element_vectors.reshape(nvectors, len(element_indices)).ravel(),
+            (np.tile(element_indices, nvectors), columns),
+        ),
+        shape=(n, nvectors),
+    ).toarray()
+
+
+def assemble_transformed_matrix(element_matrices, transformation):
+    # T^T blockdiag(k_e) T, the rows of T are the DoFs of the elements
+    element_matrices = np.asarray(element_matrices, dtype=float).reshape(-1, 6, 6)
+    indices = np.arange(element_matrices.size // 6).reshape(-1, 6)
+
+    block_diagonal = assemble_sparse_matrix(element_matrices, indices, indices.size)
+
+    return (transformation.T @ block_diagonal @ transformation).tocsr()
@@ -4,6 +4,8 @@ import numpy as np
 from numpy.testing import assert_array_equal
 
 from helper_functions import (
+    assemble_sparse_matrix,
+    assemble_vector,
     delete_columns_from_matrix,
     delete_rows_and_columns_from_matrix,
     delete_rows_from_matrix,
@@ -60,3 +62,33 @@ class TestHelperFunctions(unittest.TestCase):
             ),
         )
         self.assert_matrix_was_not_modified(m)
+
+    def test_assemble_sparse_matrix(self):
+        element_matrices = np.array(
+            [
+                np.arange(4).reshape(2, 2),
+                10 * np.arange(4).reshape(2, 2),
+            ]
+        )
+
+        assert_array_equal(
+            assemble_sparse_matrix(element_matrices, [[0, 1], [1, 2]], 3).toarray(),
+            np.array(
+                [
+                    [0, 1, 0],
+                    [2, 3, 10],
+                    [0, 20, 30],
+                ]
+            ),
+        )
+
+    def test_assemble_sparse_matrix_without_elements(self):
+        assert_array_equal(
+            assemble_sparse_matrix([], np.zeros((0, 6)), 2).toarray(), np.zeros((2, 2))
+        )
+
+    def test_assemble_vector(self):
+        assert_array_equal(
+            assemble_vector([[1, 2], [3, 4]], [[0, 1], [1, 2]], 4),
+            np.array([1, 5, 4, 0]),
+        )
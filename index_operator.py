@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class IndexOperator:
+
+    # Selection matrix S with S[i, indices[i]] = 1 which is never built, S x
+    # gathers x[indices] and S^T y adds y to the positions in indices
+
+    # Products with NumPy arrays on the left are handled by __rmatmul__
+    __array_ufunc__ = None
+
+    ndim = 2
+
+    def __init__(self, indices, ncolumns, transposed=False):
+        self.indices = np.asarray(indices, dtype=int)
+        self.ncolumns = ncolumns
+        self.transposed = transposed
+
+        if transposed:
+            self.shape = (ncolumns, len(self.indices))
+        else:
+            self.shape = (len(self.indices), ncolumns)
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def transpose(self):
+        return IndexOperator(self.indices, self.ncolumns, not self.transposed)
+
+    def apply(self, x):
+        x = np.asarray(x)
+
+        if x.shape[0] != self.shape[1]:
+            raise OperandDoesNotMatchIndexOperator()
+
+        if not self.transposed:
+            return x[self.indices]
+
+        y = np.zeros((self.ncolumns, *x.shape[1:]), dtype=np.result_type(x, float))
+        np.add.at(y, self.indices, x)
+
+        return y
+
+    def compose(self, other):
+        if other.shape[0] != self.shape[1]:
+            raise OperandDoesNotMatchIndexOperator()
+
+        # S_1 S_2 x = x[indices_2][indices_1]
+        if not self.transposed and not other.transposed:
+            return IndexOperator(other.indices[self.indices], other.ncolumns)
+
+        # S_1^T S_2^T = (S_2 S_1)^T
+        if self.transposed and other.transposed:
+            return other.T.compose(self.T).T
+
+        # Mixed products are no selections in general
+        return self.apply(np.asarray(other))
+
+    def dot(self, other):
+        if isinstance(other, IndexOperator):
+            return self.compose(other)
+
+        return self.apply(other)
+
+    def __matmul__(self, other):
+        return self.dot(other)
+
+    def __rmatmul__(self, other):
+        # x S = (S^T x^T)^T
+        return self.T.apply(np.asarray(other).T).T
+
+    def __array__(self, dtype=None, copy=None):
+        return self.apply(np.eye(self.shape[1], dtype=dtype))
+
+
+class OperandDoesNotMatchIndexOperator(ValueError):
+    pass
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from index_operator import IndexOperator, OperandDoesNotMatchIndexOperator
+
+
+class TestIndexOperator(unittest.TestCase):
+
+    def setUp(self):
+        self.operator = IndexOperator([3, 0, 3], 5)
+        self.matrix = np.eye(5)[[3, 0, 3]]
+
+    def test_shape(self):
+        self.assertEqual(self.operator.shape, (3, 5))
+        self.assertEqual(self.operator.T.shape, (5, 3))
+
+    def test_array(self):
+        assert_array_equal(np.asarray(self.operator), self.matrix)
+        assert_array_equal(np.asarray(self.operator.T), self.matrix.T)
+
+    def test_gather(self):
+        x = np.arange(10.0).reshape(5, 2)
+
+        assert_array_equal(self.operator @ x, self.matrix @ x)
+        assert_array_equal(self.operator.dot(x[:, 0]), self.matrix.dot(x[:, 0]))
+
+    def test_scatter(self):
+        y = np.array([1.0, 2.0, 4.0])
+
+        assert_array_equal(self.operator.T @ y, self.matrix.T @ y)
+
+    def test_array_on_the_left(self):
+        a = np.arange(15.0).reshape(5, 3)
+
+        assert_array_equal(a @ self.operator, a @ self.matrix)
+        assert_array_equal(a.T @ self.operator.T, a.T @ self.matrix.T)
+
+    def test_compose(self):
+        other = IndexOperator([4, 2, 1, 0, 3], 5)
+        other_matrix = np.asarray(other)
+
+        composed = self.operator @ other
+
+        self.assertIsInstance(composed, IndexOperator)
+        assert_array_equal(composed, self.matrix @ other_matrix)
+        assert_array_equal(other.T @ self.operator.T, other_matrix.T @ self.matrix.T)
+        assert_array_equal(self.operator @ self.operator.T, self.matrix @ self.matrix.T)
+
+    def test_operand_does_not_match(self):
+        with self.assertRaises(OperandDoesNotMatchIndexOperator):
+            self.operator @ np.zeros(4)
+
+
+if __name__ == "__main__":
+    unittest.main()
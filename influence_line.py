@@ -0,0 +1,86 @@
+import numpy as np
+
+from static_system import ElementDoesNotExist
+from utilities import get_point_load_vectors
+from vector import vector
+
+
+class InfluenceLineSolver:
+
+    # The influence line of a response is the response to a unit load moving
+    # along a path of elements. With the adjoint vector of the response every
+    # load position only costs a dot product with its consistent load vector
+
+    def __init__(self, solver):
+        self.solver = solver
+
+    def get_load_positions(self, path, n=21):
+        path = np.asarray(path, dtype=int)
+        nelements = len(self.solver.static_system.get_elements())
+
+        if path.size == 0 or path.min() < 1 or path.max() > nelements:
+            raise ElementDoesNotExist(path)
+
+        element_ids = np.repeat(path, n)
+        xi = np.tile(np.linspace(0, 1, n), len(path))
+
+        return element_ids, xi
+
+    def get_points(self, path, n=21):
+        element_ids, xi = self.get_load_positions(path, n=n)
+        properties = self.solver.get_element_properties()
+
+        p_i = properties["p_i"][element_ids - 1]
+        p_k = properties["p_k"][element_ids - 1]
+
+        return p_i + xi[:, None] * (p_k - p_i)
+
+    def get_unit_load_vectors(self, element_ids, xi, direction=vector(0, 1)):
+        element_ids = np.asarray(element_ids, dtype=int)
+
+        l, _, _ = self.solver.get_geometry_of_elements()
+        tau = self.solver.get_tau_of_elements()[element_ids - 1]
+
+        p_x, p_z = np.einsum("pij,j->ip", tau[:, 0:2, 0:2], direction)
+
+        local_load_vectors = get_point_load_vectors(
+            l=l[element_ids - 1], xi=xi, p_x=p_x, p_z=p_z
+        )
+
+        return np.einsum("pji,pj->pi", tau, local_load_vectors)
+
+    def get_influence_ordinates(
+        self, responses, element_ids, xi, direction=vector(0, 1)
+    ):
+        element_ids = np.asarray(element_ids, dtype=int)
+        load_vectors = self.get_unit_load_vectors(element_ids, xi, direction)
+
+        # Ordinates of all load positions (rows) and responses (columns), the
+        # adjoint vectors are gathered once for every element of the path
+        b = self.solver.get_adjoint_vectors(responses)
+        c = self.solver.get_in_element_response_vectors(responses)
+        response_ids = np.array([id for id, _ in responses], dtype=int)
+
+        unique_ids, inverse = np.unique(element_ids, return_inverse=True)
+        b_of_elements = self.solver.gather(b, ids=unique_ids)
+
+        ordinates = np.zeros((len(element_ids), len(responses)))
+
+        for j, id in enumerate(unique_ids):
+            rows = np.flatnonzero(inverse.reshape(-1) == j)
+            ordinates[rows] = load_vectors[rows] @ b_of_elements[j]
+
+            # Loads inside the element of a response contribute directly
+            columns = np.flatnonzero(response_ids == id)
+            ordinates[np.ix_(rows, columns)] += load_vectors[rows] @ c[columns].T
+
+        return ordinates
+
+    def get_influence_line(
+        self, id, response_parameter, path, n=21, direction=vector(0, 1)
+    ):
+        element_ids, xi = self.get_load_positions(path, n=n)
+
+        return self.get_influence_ordinates(
+            [(id, response_parameter)], element_ids, xi, direction=direction
+        )[:, 0]
@@ -0,0 +1,107 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from example_static_systems import (
+    create_beam_on_two_supports_with_cantilever_arm,
+    create_bernoulli_beam_with_area_load,
+)
+from influence_line import InfluenceLineSolver
+from models.response_variable import (
+    ResponseVariableDisplacement,
+    ResponseVariableInternalForce,
+)
+from static_system import ElementDoesNotExist
+from static_system_solver import StaticSystemSolver
+from utilities import get_w_displacement_curve
+from vector import vector
+
+
+class TestInfluenceLine(unittest.TestCase):
+
+    def test_influence_lines_of_shear_forces(self):
+        solver = StaticSystemSolver(create_bernoulli_beam_with_area_load(q_z=0))
+        influence_line_solver = InfluenceLineSolver(solver)
+
+        xi = np.linspace(0, 1, 5)
+
+        assert_allclose(
+            influence_line_solver.get_influence_line(
+                1, ResponseVariableInternalForce.V_I, path=[1], n=5
+            ),
+            1 - xi,
+            atol=1e-12,
+        )
+        assert_allclose(
+            influence_line_solver.get_influence_line(
+                1, ResponseVariableInternalForce.V_K, path=[1], n=5
+            ),
+            -xi,
+            atol=1e-12,
+        )
+
+    def test_influence_line_of_displacement_equals_deflection(self):
+        # Maxwell: the influence line of the deflection at the tip is the
+        # deflection of the beam caused by a unit load at the tip
+        solver = StaticSystemSolver(
+            create_beam_on_two_supports_with_cantilever_arm(F_right=0)
+        )
+        influence_line = InfluenceLineSolver(solver).get_influence_line(
+            2, ResponseVariableDisplacement.W_K, path=[1, 2], n=11
+        )
+
+        loaded_solver = StaticSystemSolver(
+            create_beam_on_two_supports_with_cantilever_arm(F_right=1)
+        )
+
+        for id in (1, 2):
+            _, w_i, _, _, w_k, _ = loaded_solver.get_local_displacements_of_element(id)
+            _, _, m_y_i, _, _, m_y_k = loaded_solver.get_internal_forces_of_element(id)
+            e = loaded_solver.static_system.get_element(id)
+
+            assert_allclose(
+                influence_line[(id - 1) * 11 : id * 11],
+                get_w_displacement_curve(
+                    w_i=w_i,
+                    w_k=w_k,
+                    m_y_i=m_y_i,
+                    m_y_k=m_y_k,
+                    q_z=0,
+                    l=e.get_length(),
+                    EI=e.EI,
+                )(np.linspace(0, 1, 11)),
+                atol=1e-12,
+            )
+
+    def test_get_points(self):
+        solver = StaticSystemSolver(
+            create_beam_on_two_supports_with_cantilever_arm(F_right=0)
+        )
+        influence_line_solver = InfluenceLineSolver(solver)
+
+        assert_allclose(
+            influence_line_solver.get_points(path=[2, 1], n=3),
+            np.array([[2, 0], [2.5, 0], [3, 0], [0, 0], [1, 0], [2, 0]]),
+        )
+
+        with self.assertRaises(ElementDoesNotExist):
+            influence_line_solver.get_points(path=[3])
+
+    def test_horizontal_unit_load(self):
+        solver = StaticSystemSolver(create_bernoulli_beam_with_area_load(q_z=0))
+        influence_line_solver = InfluenceLineSolver(solver)
+
+        # The horizontal support is at node i, so the bar is in tension
+        # between the support and the load
+        for response_parameter, expected_influence_line in (
+            (ResponseVariableInternalForce.N_I, vector(1, 1, 1)),
+            (ResponseVariableInternalForce.N_K, vector(0, 0, 0)),
+        ):
+            assert_allclose(
+                influence_line_solver.get_influence_line(
+                    1, response_parameter, path=[1], n=3, direction=vector(1, 0)
+                ),
+                expected_influence_line,
+                atol=1e-12,
+            )
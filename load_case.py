@@ -0,0 +1,54 @@
+import numpy as np
+
+LOADS = (
+    "f_x_i",
+    "f_z_i",
+    "m_y_i",
+    "f_x_k",
+    "f_z_k",
+    "m_y_k",
+    "q_x",
+    "q_z",
+)
+
+
+class LoadCase:
+
+    def __init__(self, name, nelements=0):
+        self.name = name
+
+        # One row of element loads per element, independent of the loads which
+        # are stored on the elements themselves
+        self.loads = np.zeros((nelements, len(LOADS)))
+
+    def get_nelements(self):
+        return len(self.loads)
+
+    def get_loads(self):
+        return {name: self.loads[:, j] for j, name in enumerate(LOADS)}
+
+    def get_element_loads(self, id):
+        return dict(zip(LOADS, self.loads[id - 1]))
+
+    def set_element_loads(self, id, **loads):
+        for name, value in loads.items():
+            if name not in LOADS:
+                raise UnknownLoad(name)
+
+            self.loads[id - 1, LOADS.index(name)] = value
+
+    def insert_element(self, index):
+        self.loads = np.insert(self.loads, index, 0, axis=0)
+
+    def delete_element(self, index):
+        self.loads = np.delete(self.loads, index, axis=0)
+
+    def __eq__(self, other):
+        if not isinstance(other, LoadCase):
+            return NotImplemented
+
+        return self.name == other.name and np.array_equal(self.loads, other.loads)
+
+
+class UnknownLoad(Exception):
+    pass
@@ -0,0 +1,31 @@
+import unittest
+
+from numpy.testing import assert_array_equal
+
+from load_case import LoadCase, UnknownLoad
+from vector import vector
+
+
+class TestLoadCase(unittest.TestCase):
+
+    def test_set_element_loads(self):
+        load_case = LoadCase("dead load", nelements=2)
+
+        load_case.set_element_loads(2, q_z=3, f_x_i=1)
+
+        self.assertEqual(load_case.get_element_loads(2)["q_z"], 3)
+        assert_array_equal(load_case.get_loads()["f_x_i"], vector(0, 1))
+
+        with self.assertRaises(UnknownLoad):
+            load_case.set_element_loads(1, EA=1)
+
+    def test_insert_and_delete_element(self):
+        load_case = LoadCase("snow", nelements=2)
+        load_case.set_element_loads(1, q_z=1)
+        load_case.set_element_loads(2, q_z=2)
+
+        load_case.insert_element(1)
+        assert_array_equal(load_case.get_loads()["q_z"], vector(1, 0, 2))
+
+        load_case.delete_element(0)
+        assert_array_equal(load_case.get_loads()["q_z"], vector(0, 2))
@@ -0,0 +1,123 @@
+import numpy as np
+
+from static_system import LoadCaseDoesNotExist
+from utilities import (
+    get_bending_moment_curve,
+    get_normal_force_curve,
+    get_shear_force_curve,
+    get_w_displacement_curve,
+)
+
+CURVES = ("N", "V", "M", "w")
+
+
+class LoadCombination:
+
+    def __init__(self, name, factors):
+        self.name = name
+
+        # Load case name -> factor, load cases which are missing have factor 0
+        self.factors = dict(factors)
+
+
+class LoadCombinationSolver:
+
+    # The problem is linear, so every combination is a linear combination of
+    # the results of the load cases, which are all solved with the same
+    # factorization
+
+    def __init__(self, solver, combinations):
+        self.solver = solver
+        self.combinations = list(combinations)
+
+    def get_combination_names(self):
+        return [c.name for c in self.combinations]
+
+    def get_factors(self):
+        names = self.solver.get_load_case_names()
+
+        factors = np.zeros((len(names), len(self.combinations)))
+
+        for j, combination in enumerate(self.combinations):
+            for name, factor in combination.factors.items():
+                if name not in names:
+                    raise LoadCaseDoesNotExist(name)
+
+                factors[names.index(name), j] = factor
+
+        return factors
+
+    def get_displacements(self):
+        return self.solver.get_displacements_of_load_cases() @ self.get_factors()
+
+    def get_external_forces(self):
+        return self.solver.get_external_forces_of_load_cases() @ self.get_factors()
+
+    def get_internal_forces(self):
+        return np.einsum(
+            "lc,lei->cei",
+            self.get_factors(),
+            self.solver.get_internal_forces_of_load_cases(),
+        )
+
+    def get_local_displacements(self):
+        u = np.moveaxis(self.solver.gather(self.get_displacements()), -1, 0)
+
+        return np.einsum("eij,cej->cei", self.solver.get_tau_of_elements(), u)
+
+    def get_local_area_loads(self):
+        load_cases = self.solver.static_system.load_cases.values()
+        _, cosine, sine = self.solver.get_geometry_of_elements()
+
+        q = np.zeros((len(load_cases), len(cosine), 2))
+
+        for i, load_case in enumerate(load_cases):
+            loads = load_case.get_loads()
+            q[i, :, 0] = cosine * loads["q_x"] - sine * loads["q_z"]
+            q[i, :, 1] = sine * loads["q_x"] + cosine * loads["q_z"]
+
+        return np.einsum("lc,lei->cei", self.get_factors(), q)
+
+    def get_curves(self, n=51):
+        x = np.linspace(0, 1, n)
+
+        properties = self.solver.get_element_properties()
+        l, _, _ = self.solver.get_geometry_of_elements()
+
+        # Shapes (C, E, 1) which broadcast with the sampling points to (C, E, n)
+        s = self.get_internal_forces()[..., None]
+        u = self.get_local_displacements()[..., None]
+        q_z = self.get_local_area_loads()[:, :, 1, None]
+
+        l = l[:, None]
+        EI = properties["EI"][:, None]
+
+        return {
+            "N": get_normal_force_curve(n_i=s[:, :, 0], n_k=s[:, :, 3])(x),
+            "V": get_shear_force_curve(v_i=s[:, :, 1], v_k=s[:, :, 4])(x),
+            "M": get_bending_moment_curve(
+                m_y_i=s[:, :, 2], m_y_k=s[:, :, 5], q_z=q_z, l=l
+            )(x),
+            "w": get_w_displacement_curve(
+                w_i=u[:, :, 1],
+                w_k=u[:, :, 4],
+                m_y_i=s[:, :, 2],
+                m_y_k=s[:, :, 5],
+                q_z=q_z,
+                l=l,
+                EI=EI,
+            )(x),
+        }
+
+    def get_envelopes(self, n=51):
+        if not self.combinations:
+            raise NoLoadCombinations()
+
+        return {
+            name: (curve.min(axis=0), curve.max(axis=0))
+            for name, curve in self.get_curves(n=n).items()
+        }
+
+
+class NoLoadCombinations(Exception):
+    pass
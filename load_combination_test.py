@@ -0,0 +1,96 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from example_static_systems import create_beam_on_two_supports_with_cantilever_arm
+from load_combination import (
+    LoadCombination,
+    LoadCombinationSolver,
+    NoLoadCombinations,
+)
+from static_system import LoadCaseDoesNotExist
+from static_system_solver import StaticSystemSolver
+from utilities import get_bending_moment_curve
+
+
+def create_static_system_with_load_cases():
+    static_system = create_beam_on_two_supports_with_cantilever_arm(F_right=0)
+
+    static_system.create_load_case("G")
+    static_system.set_element_loads("G", id=1, q_z=1)
+    static_system.set_element_loads("G", id=2, q_z=1)
+    static_system.create_load_case("Q")
+    static_system.set_element_loads("Q", id=2, f_z_k=1)
+
+    return static_system
+
+
+class TestLoadCombination(unittest.TestCase):
+
+    def test_combination_equals_solution_of_combined_loads(self):
+        solver = StaticSystemSolver(create_static_system_with_load_cases())
+        combination_solver = LoadCombinationSolver(
+            solver, [LoadCombination("ULS", {"G": 1.35, "Q": 1.5})]
+        )
+
+        single_solver = StaticSystemSolver(
+            create_beam_on_two_supports_with_cantilever_arm(
+                F_right=1.5, q_z_1=1.35, q_z_2=1.35
+            )
+        )
+
+        assert_allclose(
+            combination_solver.get_displacements()[:, 0],
+            single_solver.get_displacements(),
+        )
+        assert_allclose(
+            combination_solver.get_external_forces()[:, 0],
+            single_solver.get_external_forces(),
+            atol=1e-12,
+        )
+
+        x = np.linspace(0, 1, 11)
+        M = combination_solver.get_curves(n=11)["M"]
+
+        for id in (1, 2):
+            _, _, m_y_i, _, _, m_y_k = single_solver.get_internal_forces_of_element(id)
+            e = single_solver.static_system.get_element(id)
+
+            assert_allclose(
+                M[0, id - 1],
+                get_bending_moment_curve(
+                    m_y_i=m_y_i, m_y_k=m_y_k, q_z=1.35, l=e.get_length()
+                )(x),
+                atol=1e-12,
+            )
+
+    def test_get_envelopes(self):
+        solver = StaticSystemSolver(create_static_system_with_load_cases())
+        combination_solver = LoadCombinationSolver(
+            solver,
+            [
+                LoadCombination("G", {"G": 1}),
+                LoadCombination("G+Q", {"G": 1, "Q": 1}),
+                LoadCombination("-Q", {"Q": -1}),
+            ],
+        )
+
+        curves = combination_solver.get_curves(n=5)
+        envelopes = combination_solver.get_envelopes(n=5)
+
+        for name in ("N", "V", "M", "w"):
+            self.assertEqual(np.shape(curves[name]), (3, 2, 5))
+            assert_allclose(envelopes[name][0], np.min(curves[name], axis=0))
+            assert_allclose(envelopes[name][1], np.max(curves[name], axis=0))
+
+        with self.assertRaises(NoLoadCombinations):
+            LoadCombinationSolver(solver, []).get_envelopes()
+
+    def test_unknown_load_case(self):
+        solver = StaticSystemSolver(create_static_system_with_load_cases())
+
+        with self.assertRaises(LoadCaseDoesNotExist):
+            LoadCombinationSolver(
+                solver, [LoadCombination("W", {"W": 1.5})]
+            ).get_factors()
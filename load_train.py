@@ -0,0 +1,199 @@
+import numpy as np
+
+from influence_line import InfluenceLineSolver
+from models.response_variable import ResponseVariableInternalForce
+from static_system import ElementDoesNotExist
+from vector import vector
+
+
+class LoadTrain:
+
+    def __init__(self, axle_loads, axle_spacings=(), lane_load=0):
+        self.axle_loads = np.asarray(axle_loads, dtype=float)
+
+        # Distances of the axles behind the first axle
+        self.axle_offsets = np.concatenate([[0], np.cumsum(axle_spacings)])
+
+        if len(self.axle_offsets) != len(self.axle_loads):
+            raise AxleSpacingsDoNotMatchAxleLoads()
+
+        self.lane_load = lane_load
+
+    def get_length(self):
+        return self.axle_offsets[-1]
+
+
+class LoadTrainSolver:
+
+    # A load train is moved along a path of elements, the response to every
+    # position is the sum of the influence ordinates at the axles times the
+    # axle loads, so all positions are evaluated from one set of ordinates
+
+    def __init__(self, solver, path, direction=vector(0, 1)):
+        self.solver = solver
+        self.influence_line_solver = InfluenceLineSolver(solver)
+
+        self.path = np.asarray(path, dtype=int)
+        self.direction = direction
+
+        nelements = len(solver.static_system.get_elements())
+        if self.path.size == 0 or self.path.min() < 1 or self.path.max() > nelements:
+            raise ElementDoesNotExist(path)
+
+    def get_element_lengths(self):
+        l, _, _ = self.solver.get_geometry_of_elements()
+
+        return l[self.path - 1]
+
+    def get_stations(self):
+        return np.concatenate([[0], np.cumsum(self.get_element_lengths())])
+
+    def get_path_length(self):
+        return self.get_stations()[-1]
+
+    def get_reversed(self):
+        # An element is traversed from k to i if its node i is the end of the
+        # path so far
+        properties = self.solver.get_element_properties()
+        p_i = properties["p_i"][self.path - 1]
+        p_k = properties["p_k"][self.path - 1]
+
+        is_reversed = np.zeros(len(self.path), dtype=bool)
+
+        if len(self.path) > 1:
+            is_reversed[0] = np.allclose(p_i[0], p_i[1]) or np.allclose(p_i[0], p_k[1])
+
+        end = p_i[0] if is_reversed[0] else p_k[0]
+
+        for j in range(1, len(self.path)):
+            is_reversed[j] = np.allclose(p_k[j], end)
+            end = p_i[j] if is_reversed[j] else p_k[j]
+
+        return is_reversed
+
+    def locate(self, s):
+        s = np.asarray(s, dtype=float)
+        stations = self.get_stations()
+
+        j = np.clip(
+            np.searchsorted(stations, s, side="right") - 1, 0, len(self.path) - 1
+        )
+        xi = np.clip((s - stations[j]) / self.get_element_lengths()[j], 0, 1)
+
+        xi = np.where(self.get_reversed()[j], 1 - xi, xi)
+
+        return self.path[j], xi
+
+    def get_influence_ordinates(self, responses, s):
+        element_ids, xi = self.locate(s)
+
+        return self.influence_line_solver.get_influence_ordinates(
+            responses, element_ids, xi, direction=self.direction
+        )
+
+    def get_all_internal_force_responses(self):
+        return [
+            (id, response_parameter)
+            for id in range(1, len(self.solver.static_system.get_elements()) + 1)
+            for response_parameter in ResponseVariableInternalForce
+        ]
+
+    def get_positions(self, load_train, step):
+        # Positions of the first axle, from entering to leaving the path
+        end = self.get_path_length() + load_train.get_length()
+        n = max(int(np.ceil(end / step)), 1) + 1
+
+        return np.linspace(0, end, n)
+
+    def get_grid(self, step):
+        n = max(int(np.ceil(self.get_path_length() / step)), 1) + 1
+
+        return np.linspace(0, self.get_path_length(), n)
+
+    def interpolate(self, grid, ordinates, s):
+        # Linear interpolation of the ordinates (grid, responses) at s, zero
+        # outside of the path
+        s = np.asarray(s, dtype=float)
+        h = grid[1] - grid[0]
+
+        j = np.clip(np.floor(s / h).astype(int), 0, len(grid) - 2)
+        t = (s - grid[j]) / h
+
+        values = ordinates[j] * (1 - t)[:, None] + ordinates[j + 1] * t[:, None]
+        values[(s < 0) | (s > grid[-1])] = 0
+
+        return values
+
+    def get_responses(self, load_train, responses, step=0.1, grid_ordinates=None):
+        # The ordinates are computed once on the station grid, every axle adds
+        # a shifted copy weighted with its load
+        if grid_ordinates is None:
+            grid = self.get_grid(step)
+            grid_ordinates = grid, self.get_influence_ordinates(responses, grid)
+
+        grid, ordinates = grid_ordinates
+        positions = self.get_positions(load_train, step)
+
+        values = np.zeros((len(positions), len(responses)))
+
+        for offset, axle_load in zip(load_train.axle_offsets, load_train.axle_loads):
+            values += axle_load * self.interpolate(grid, ordinates, positions - offset)
+
+        return positions, values
+
+    def get_lane_load_responses(
+        self, load_train, responses, step=0.1, grid_ordinates=None
+    ):
+        # The lane load is placed where the influence line is adverse
+        if grid_ordinates is None:
+            grid = self.get_grid(step)
+            grid_ordinates = grid, self.get_influence_ordinates(responses, grid)
+
+        s, ordinates = grid_ordinates
+
+        # Trapezoidal rule over the positive and the negative ordinates
+        weights = np.zeros(len(s))
+        weights[1:] += np.diff(s) / 2
+        weights[:-1] += np.diff(s) / 2
+
+        return (
+            load_train.lane_load * weights @ np.maximum(ordinates, 0),
+            load_train.lane_load * weights @ np.minimum(ordinates, 0),
+        )
+
+    def get_envelopes(self, load_train, responses=None, step=0.1):
+        if responses is None:
+            responses = self.get_all_internal_force_responses()
+
+        grid = self.get_grid(step)
+        grid_ordinates = grid, self.get_influence_ordinates(responses, grid)
+
+        positions, values = self.get_responses(
+            load_train, responses, step=step, grid_ordinates=grid_ordinates
+        )
+        lane_max, lane_min = self.get_lane_load_responses(
+            load_train, responses, step=step, grid_ordinates=grid_ordinates
+        )
+
+        i_max = np.argmax(values, axis=0)
+        i_min = np.argmin(values, axis=0)
+        r = np.arange(len(responses))
+
+        return {
+            "max": values[i_max, r] + lane_max,
+            "min": values[i_min, r] + lane_min,
+            "max_position": positions[i_max],
+            "min_position": positions[i_min],
+        }
+
+    def get_envelopes_of_elements(self, load_train, step=0.1):
+        nelements = len(self.solver.static_system.get_elements())
+
+        return {
+            name: envelope.reshape(nelements, len(ResponseVariableInternalForce))
+            for name, envelope in self.get_envelopes(load_train, step=step).items()
+        }
+
+
+class AxleSpacingsDoNotMatchAxleLoads(Exception):
+    pass
@@ -0,0 +1,109 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from example_static_systems import (
+    create_beam_on_two_supports_with_cantilever_arm,
+    create_bernoulli_beam_with_area_load,
+)
+from influence_line import InfluenceLineSolver
+from load_train import AxleSpacingsDoNotMatchAxleLoads, LoadTrain, LoadTrainSolver
+from models.response_variable import (
+    ResponseVariableDisplacement,
+    ResponseVariableInternalForce,
+)
+from static_system_solver import StaticSystemSolver
+
+
+class TestLoadTrain(unittest.TestCase):
+
+    def test_single_axle_follows_the_influence_line(self):
+        solver = StaticSystemSolver(
+            create_beam_on_two_supports_with_cantilever_arm(F_right=0)
+        )
+        load_train_solver = LoadTrainSolver(solver, path=[1, 2])
+        response = (2, ResponseVariableDisplacement.W_K)
+
+        positions, values = load_train_solver.get_responses(
+            LoadTrain(axle_loads=[2]), [response], step=0.5
+        )
+
+        assert_allclose(positions, np.linspace(0, 3, 7))
+        assert_allclose(
+            values[:, 0],
+            2
+            * InfluenceLineSolver(solver).get_influence_line(
+                *response, path=[1, 2], n=5
+            )[[0, 1, 2, 3, 5, 7, 9]],
+            atol=1e-12,
+        )
+
+    def test_get_envelopes_of_elements(self):
+        solver = StaticSystemSolver(
+            create_beam_on_two_supports_with_cantilever_arm(F_right=0)
+        )
+        load_train = LoadTrain(axle_loads=[1, 1], axle_spacings=[0.5])
+
+        envelopes = LoadTrainSolver(solver, path=[1, 2]).get_envelopes_of_elements(
+            load_train, step=0.5
+        )
+
+        self.assertEqual(np.shape(envelopes["max"]), (2, 6))
+
+        # Both axles close to the left support
+        self.assertAlmostEqual(envelopes["max"][0, 1], 1.75)
+        self.assertAlmostEqual(envelopes["max_position"][0, 1], 0.5)
+
+        # Both axles on the cantilever arm
+        self.assertAlmostEqual(envelopes["min"][1, 2], -1.5)
+        self.assertAlmostEqual(envelopes["min_position"][1, 2], 3)
+
+    def test_lane_load(self):
+        solver = StaticSystemSolver(create_bernoulli_beam_with_area_load(q_z=0))
+        load_train = LoadTrain(axle_loads=[0], lane_load=2)
+
+        envelopes = LoadTrainSolver(solver, path=[1]).get_envelopes(
+            load_train, responses=[(1, ResponseVariableInternalForce.V_I)]
+        )
+
+        assert_allclose(envelopes["max"], [1])
+        assert_allclose(envelopes["min"], [0])
+
+    def test_reversed_elements_in_path(self):
+        solver = StaticSystemSolver(
+            create_beam_on_two_supports_with_cantilever_arm(F_right=0)
+        )
+        load_train_solver = LoadTrainSolver(solver, path=[2, 1])
+
+        element_ids, xi = load_train_solver.locate([0, 0.5, 1, 2])
+
+        assert_allclose(element_ids, [2, 2, 1, 1])
+        assert_allclose(xi, [1, 0.5, 1, 0.5])
+
+    def test_axles_are_shifted_copies_of_the_grid_ordinates(self):
+        solver = StaticSystemSolver(
+            create_beam_on_two_supports_with_cantilever_arm(F_right=0)
+        )
+        load_train_solver = LoadTrainSolver(solver, path=[1, 2])
+        load_train = LoadTrain(axle_loads=[1, 2, 3], axle_spacings=[0.25, 0.5])
+        responses = load_train_solver.get_all_internal_force_responses()
+
+        positions, values = load_train_solver.get_responses(
+            load_train, responses, step=0.25
+        )
+
+        # Every axle at the grid points, loads off the path do not count
+        expected = np.zeros_like(values)
+        for offset, axle_load in zip(load_train.axle_offsets, load_train.axle_loads):
+            s = positions - offset
+            on_path = (s >= 0) & (s <= 3)
+            expected[on_path] += axle_load * load_train_solver.get_influence_ordinates(
+                responses, s[on_path]
+            )
+
+        assert_allclose(values, expected, atol=1e-12)
+
+    def test_axle_spacings_must_match_axle_loads(self):
+        with self.assertRaises(AxleSpacingsDoNotMatchAxleLoads):
+            LoadTrain(axle_loads=[1, 2], axle_spacings=[1, 2])
@@ -61,13 +61,10 @@ from new_utilities import (
     set_lim,
 )
 from utilities import (
-    get_bending_moment_curve,
     get_derived_bending_moment_curve,
     get_derived_normal_force_curve,
     get_derived_shear_force_curve,
     get_dofs_of_element,
-    get_normal_force_curve,
-    get_shear_force_curve,
     plot_bending_moment,
     plot_derived_bending_moment,
     plot_derived_normal_force,
@@ -323,6 +320,11 @@ class MainWindow(QMainWindow):
         self.color_quantity = None
         self.color_functions = None
 
+        self.mechanism_mode_of_elements = None
+        self.mechanism_frame = 0
+        self.mechanism_timer = QTimer(self)
+        self.mechanism_timer.timeout.connect(self.draw_mechanism)
+
         # self.load_static_system_from_file()
 
     def get_coords_of_node(self, id):
@@ -553,34 +555,19 @@ class MainWindow(QMainWindow):
         self.init_static_system()
 
     def solve(self):
-        solver = StaticSystemSolver(self.static_system)
-        det = np.linalg.det(solver.get_non_restrained_k())
-        if np.isclose(det, 0):
+        solver = self.solver
+        self.mechanism_timer.stop()
+
+        if solver.is_kinematic():
             self.solution = None
-            self.draw_plain_static_system()
-            ax = self.graph_widget.figure.gca()
-
-            ax.text(
-                0.85,
-                0.95,
-                "System is kinematic",
-                transform=ax.transAxes,
-                fontsize=12,
-                verticalalignment="center",
-                horizontalalignment="center",
-                bbox=dict(facecolor="red", alpha=0.5),
-            )
+            self.mechanism_mode_of_elements = solver.gather(solver.get_mechanism_mode())
+            self.mechanism_frame = 0
 
-            self.graph_widget.figure.canvas.draw()
+            self.draw_mechanism()
+            self.mechanism_timer.start(50)
             return
-        self.solution = StaticSystemSolution(
-            displacements=solver.get_displacements(),
-            external_forces=solver.get_external_forces(),
-            internal_forces=[
-                solver.get_internal_forces_of_element(i + 1)
-                for i in range(len(self.static_system.get_elements()))
-            ],
-        )
+
+        self.solution = StaticSystemSolution.from_solver(solver)
 
         self.plot_displacements()
         self.plot_internal_forces()
@@ -707,6 +694,7 @@ class MainWindow(QMainWindow):
                 static_system.set_restrained_dof(dof=node_dof_phi)
 
         self.static_system = static_system
+        self.solver = StaticSystemSolver(static_system)
 
         self.solve()
 
@@ -771,7 +759,38 @@ class MainWindow(QMainWindow):
             [str(i) for i in range(1, new_element_count + 1)]
         )
 
-    def draw_plain_static_system(self):
+    def draw_mechanism(self):
+        # The mechanism mode swings with an amplitude of a tenth of the size of
+        # the system
+        properties = self.static_system.get_element_properties()
+        points = np.concatenate([properties["p_i"], properties["p_k"]])
+        size = max(np.max(np.ptp(points, axis=0)), 1)
+
+        amplitude = 0.1 * size / max(Settings.scalingFactor, 1)
+        phase = 2 * np.pi * self.mechanism_frame / 40
+        self.mechanism_frame += 1
+
+        self.draw_plain_static_system(
+            displacements_of_elements=amplitude
+            * np.sin(phase)
+            * self.mechanism_mode_of_elements
+        )
+        ax = self.graph_widget.figure.gca()
+
+        ax.text(
+            0.85,
+            0.95,
+            "System is kinematic",
+            transform=ax.transAxes,
+            fontsize=12,
+            verticalalignment="center",
+            horizontalalignment="center",
+            bbox=dict(facecolor="red", alpha=0.5),
+        )
+
+        self.graph_widget.figure.canvas.draw()
+
+    def draw_plain_static_system(self, displacements_of_elements=None):
         self.graph_widget.figure.clear()
         ax = self.graph_widget.figure.add_subplot(111)
         ax.set_aspect("equal")
@@ -796,6 +815,7 @@ class MainWindow(QMainWindow):
             show_element_id=self.ui.show_element_ids.isChecked(),
             show_joints_and_supports=self.ui.show_joints_and_supports.isChecked(),
             element_line_width=self.ui.element_line_width.value(),
+            displacements_of_elements=displacements_of_elements,
         )
 
         min_x = float(self.ui.min_x.text())
@@ -863,49 +883,25 @@ class MainWindow(QMainWindow):
         self.draw_graph()
 
     def on_normal_force_plot_clicked(self, event):
-        self.color_functions = []
-
-        for i, e in enumerate(self.static_system.elements):
-            element_id = i + 1
-
-            n_i, v_i, m_y_i, n_k, v_k, m_y_k = StaticSystemSolver(
-                self.static_system
-            ).get_internal_forces_of_element(element_id)
-            self.color_functions.append(get_normal_force_curve(n_i=n_i, n_k=n_k))
+        self.color_quantity = "n"
+        self.color_functions = None
 
         self.draw_graph()
 
     def on_shear_force_plot_clicked(self, event):
-        self.color_functions = []
-
-        for i, e in enumerate(self.static_system.elements):
-            element_id = i + 1
-
-            n_i, v_i, m_y_i, n_k, v_k, m_y_k = StaticSystemSolver(
-                self.static_system
-            ).get_internal_forces_of_element(element_id)
-            self.color_functions.append(get_shear_force_curve(v_i=v_i, v_k=v_k))
+        self.color_quantity = "v"
+        self.color_functions = None
 
         self.draw_graph()
 
     def on_bending_moment_plot_clicked(self, event):
-        self.color_functions = []
-
-        for i, e in enumerate(self.static_system.elements):
-            element_id = i + 1
-            _, q_z = e.get_local_area_loads()
-            l = e.get_length()
-
-            n_i, v_i, m_y_i, n_k, v_k, m_y_k = StaticSystemSolver(
-                self.static_system
-            ).get_internal_forces_of_element(element_id)
-            self.color_functions.append(
-                get_bending_moment_curve(m_y_i=m_y_i, m_y_k=m_y_k, q_z=q_z, l=l)
-            )
+        self.color_quantity = "m_y"
+        self.color_functions = None
 
         self.draw_graph()
 
     def on_derived_normal_force_plot_clicked(self, event):
+        self.color_quantity = None
         self.color_functions = []
 
         design_parameter = DesignParameterElement(
@@ -919,10 +915,10 @@ class MainWindow(QMainWindow):
         for i, e in enumerate(self.static_system.elements):
             element_id = i + 1
 
-            n_i, v_i, m_y_i, n_k, v_k, m_y_k = StaticSystemSolver(
-                self.static_system
-            ).get_derived_internal_forces_of_element(
-                element_id, param_element_id, dx=design_parameter.value
+            n_i, v_i, m_y_i, n_k, v_k, m_y_k = (
+                self.solver.get_derived_internal_forces_of_element(
+                    element_id, param_element_id, dx=design_parameter.value
+                )
             )
             self.color_functions.append(
                 get_derived_normal_force_curve(derived_n_i=n_i, derived_n_k=n_k)
@@ -931,6 +927,7 @@ class MainWindow(QMainWindow):
         self.draw_graph()
 
     def on_derived_shear_force_plot_clicked(self, event):
+        self.color_quantity = None
         self.color_functions = []
 
         design_parameter = DesignParameterElement(
@@ -944,10 +941,10 @@ class MainWindow(QMainWindow):
         for i, e in enumerate(self.static_system.elements):
             element_id = i + 1
 
-            n_i, v_i, m_y_i, n_k, v_k, m_y_k = StaticSystemSolver(
-                self.static_system
-            ).get_derived_internal_forces_of_element(
-                element_id, param_element_id, dx=design_parameter.value
+            n_i, v_i, m_y_i, n_k, v_k, m_y_k = (
+                self.solver.get_derived_internal_forces_of_element(
+                    element_id, param_element_id, dx=design_parameter.value
+                )
             )
             self.color_functions.append(
                 get_derived_shear_force_curve(derived_v_i=v_i, derived_v_k=v_k)
@@ -956,6 +953,7 @@ class MainWindow(QMainWindow):
         self.draw_graph()
 
     def on_derived_bending_moment_plot_clicked(self, event):
+        self.color_quantity = None
         self.color_functions = []
 
         design_parameter = DesignParameterElement(
@@ -969,10 +967,10 @@ class MainWindow(QMainWindow):
         for i, e in enumerate(self.static_system.elements):
             element_id = i + 1
 
-            n_i, v_i, m_y_i, n_k, v_k, m_y_k = StaticSystemSolver(
-                self.static_system
-            ).get_derived_internal_forces_of_element(
-                element_id, param_element_id, dx=dx
+            n_i, v_i, m_y_i, n_k, v_k, m_y_k = (
+                self.solver.get_derived_internal_forces_of_element(
+                    element_id, param_element_id, dx=dx
+                )
             )
             self.color_functions.append(
                 get_derived_bending_moment_curve(
@@ -995,14 +993,12 @@ class MainWindow(QMainWindow):
             element_id = int(self.ui.displacements_comboBox.currentText())
             e = self.static_system.get_element(element_id)
 
-            solver = StaticSystemSolver(self.static_system)
-
             u_i, w_i, phi_i, u_k, w_k, phi_k = (
-                solver.get_local_displacements_of_element(element_id)
-            )
-            n_i, v_i, m_y_i, n_k, v_k, m_y_k = solver.get_internal_forces_of_element(
-                element_id
+                self.solution.local_displacements_of_elements[element_id - 1]
             )
+            n_i, v_i, m_y_i, n_k, v_k, m_y_k = self.solution.internal_forces[
+                element_id - 1
+            ]
 
             q_x, q_z = e.get_local_area_loads()
             EA = e.EA
@@ -1061,9 +1057,9 @@ class MainWindow(QMainWindow):
         try:
             element_id = int(self.ui.internal_forces_comboBox.currentText())
             e = self.static_system.get_element(element_id)
-            n_i, v_i, m_y_i, n_k, v_k, m_y_k = StaticSystemSolver(
-                self.static_system
-            ).get_internal_forces_of_element(element_id)
+            n_i, v_i, m_y_i, n_k, v_k, m_y_k = self.solution.internal_forces[
+                element_id - 1
+            ]
 
             _, q_z = e.get_local_area_loads()
 
@@ -1120,7 +1116,7 @@ class MainWindow(QMainWindow):
                 self.ui.direct_sensitivity_analysis_element_0_selection.currentText()
             )
 
-            solver = StaticSystemSolver(self.static_system)
+            solver = self.solver
 
             sensa = solver.get_direct_sensa(
                 id=param_element_id, design_parameter=design_parameter
@@ -1194,17 +1190,17 @@ class MainWindow(QMainWindow):
         except:
             return
 
-        solver = StaticSystemSolver(self.static_system)
+        solver = self.solver
 
         sensa = solver.get_adjoint_sensa(
             id=response_element_id, response_parameter=response_variable
         )
 
-        for e_id in sensa.keys():
-            for p, s in sensa[e_id].items():
+        for e_id, element_sensa in enumerate(sensa, 1):
+            for p, s in zip(DesignParameterElement, element_sensa):
                 self.append_row_to_adjoint_sensitivity_analysis_table(
                     element_id=e_id,
-                    parameter=p,
+                    parameter=p.value,
                     value=s,
                 )
 
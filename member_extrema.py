@@ -0,0 +1,197 @@
+import numpy as np
+
+# Curves along the members are polynomials in x = 0 ... 1 with the coefficients
+# in ascending order, (elements, degree + 1), extrema are found at the ends and
+# at the roots of the derivative
+
+ROOT_TOLERANCE = 1e-9
+
+
+def get_linear_coefficients(value_i, value_k):
+    value_i, value_k = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(value_i, dtype=float)),
+        np.atleast_1d(np.asarray(value_k, dtype=float)),
+    )
+
+    return np.stack([value_i, value_k - value_i], axis=1)
+
+
+def get_bending_moment_coefficients(m_y_i, m_y_k, q_z, l):
+    # Same curve as utilities.get_bending_moment_curve
+    m_y_i, m_y_k, q_z, l = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (m_y_i, m_y_k, q_z, l))
+    )
+
+    return np.stack([m_y_i, m_y_k - m_y_i + q_z * l**2 / 2, -q_z * l**2 / 2], axis=1)
+
+
+def get_w_displacement_coefficients(w_i, w_k, m_y_i, m_y_k, q_z, l, EI):
+    # Same curve as utilities.get_w_displacement_curve
+    w_i, w_k, m_y_i, m_y_k, q_z, l, EI = np.broadcast_arrays(
+        *(
+            np.atleast_1d(np.asarray(v, dtype=float))
+            for v in (w_i, w_k, m_y_i, m_y_k, q_z, l, EI)
+        )
+    )
+
+    a = l**2 / 6 * m_y_i / EI
+    b = l**2 / 6 * m_y_k / EI
+    c = q_z * l**4 / 24 / EI
+
+    return np.stack([w_i, w_k - w_i + 2 * a + b + c, -3 * a, a - b - 2 * c, c], axis=1)
+
+
+def evaluate_polynomials(coefficients, x):
+    # Values of every polynomial at its own points x, (elements, npoints)
+    x = np.asarray(x, dtype=float)
+    powers = x[..., None] ** np.arange(coefficients.shape[1])
+
+    return np.einsum("epj,ej->ep", powers, coefficients)
+
+
+def get_derivative_coefficients(coefficients):
+    degree = coefficients.shape[1] - 1
+
+    return coefficients[:, 1:] * np.arange(1, degree + 1)
+
+
+def get_roots_in_unit_interval(coefficients):
+    # Real roots in [0, 1] of all polynomials, (elements, degree) padded with
+    # nan, the eigenvalues of the companion matrices are computed for all
+    # polynomials of the same effective degree at once
+    nelements, ncoefficients = coefficients.shape
+    degree = ncoefficients - 1
+
+    roots = np.full((nelements, max(degree, 0)), np.nan)
+
+    if degree < 1:
+        return roots
+
+    scale = np.max(np.abs(coefficients), axis=1, initial=0)
+    is_significant = np.abs(coefficients) > ROOT_TOLERANCE * scale[:, None]
+
+    # Index of the highest significant coefficient, -1 for zero polynomials
+    effective_degrees = np.where(
+        is_significant.any(axis=1),
+        degree - np.argmax(is_significant[:, ::-1], axis=1),
+        -1,
+    )
+
+    for d in range(1, degree + 1):
+        rows = np.flatnonzero(effective_degrees == d)
+
+        if len(rows) == 0:
+            continue
+
+        companion = np.zeros((len(rows), d, d))
+        companion[:, np.arange(1, d), np.arange(d - 1)] = 1
+        companion[:, :, -1] = -coefficients[rows, :d] / coefficients[rows, d, None]
+
+        eigenvalues = np.linalg.eigvals(companion)
+
+        is_root = (
+            (np.abs(eigenvalues.imag) <= ROOT_TOLERANCE)
+            & (eigenvalues.real >= -ROOT_TOLERANCE)
+            & (eigenvalues.real <= 1 + ROOT_TOLERANCE)
+        )
+
+        roots[rows, :d] = np.where(is_root, np.clip(eigenvalues.real, 0, 1), np.nan)
+
+    return roots
+
+
+def get_extrema(coefficients):
+    # Largest and smallest value of every polynomial in [0, 1] and their
+    # positions x
+    coefficients = np.asarray(coefficients, dtype=float)
+    nelements = len(coefficients)
+
+    candidates = np.concatenate(
+        [
+            np.zeros((nelements, 1)),
+            np.ones((nelements, 1)),
+            get_roots_in_unit_interval(get_derivative_coefficients(coefficients)),
+        ],
+        axis=1,
+    )
+
+    values = evaluate_polynomials(coefficients, np.nan_to_num(candidates))
+    is_candidate = ~np.isnan(candidates)
+
+    i_max = np.argmax(np.where(is_candidate, values, -np.inf), axis=1)
+    i_min = np.argmin(np.where(is_candidate, values, np.inf), axis=1)
+    r = np.arange(nelements)
+
+    return {
+        "max": values[r, i_max],
+        "min": values[r, i_min],
+        "max_position": candidates[r, i_max],
+        "min_position": candidates[r, i_min],
+    }
+
+
+def get_adaptive_samples(coefficients, tolerance, max_depth=10):
+    # Positions x of all polynomials, flat and in the order of the polynomials,
+    # the points of polynomial j are x[offsets[j]:offsets[j + 1]]. Intervals
+    # are bisected until the chord deviates at most tolerance from the curve
+    # at the quarter points, linear curves keep their two end points.
+    coefficients = np.asarray(coefficients, dtype=float)
+    npolynomials = len(coefficients)
+
+    quarters = np.array([0.25, 0.5, 0.75])
+
+    rows = np.arange(npolynomials)
+    a = np.zeros(npolynomials)
+    b = np.ones(npolynomials)
+
+    final_rows = []
+    final_starts = []
+
+    for depth in range(max_depth + 1):
+        x = np.concatenate(
+            [a[:, None], b[:, None], a[:, None] + (b - a)[:, None] * quarters], axis=1
+        )
+        values = evaluate_polynomials(coefficients[rows], x)
+
+        chords = values[:, :1] + (values[:, 1:2] - values[:, :1]) * quarters
+        is_fine = np.max(np.abs(values[:, 2:] - chords), axis=1) <= tolerance
+
+        if depth == max_depth:
+            is_fine[:] = True
+
+        final_rows.append(rows[is_fine])
+        final_starts.append(a[is_fine])
+
+        rows, a, b = rows[~is_fine], a[~is_fine], b[~is_fine]
+
+        if len(rows) == 0:
+            break
+
+        middle = (a + b) / 2
+
+        rows = np.repeat(rows, 2)
+        a, b = (
+            np.stack([a, middle], axis=1).ravel(),
+            np.stack([middle, b], axis=1).ravel(),
+        )
+
+    rows = np.concatenate(final_rows)
+    starts = np.concatenate(final_starts)
+    order = np.lexsort((starts, rows))
+
+    # The starts of all intervals and the end x = 1 of every polynomial
+    counts = np.bincount(rows, minlength=npolynomials) + 1
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    is_end = np.zeros(offsets[-1], dtype=bool)
+    is_end[offsets[1:] - 1] = True
+
+    x = np.ones(offsets[-1])
+    x[~is_end] = starts[order]
+
+    return offsets, x
+
+
+def evaluate_flat(coefficients, rows, x):
+    # Values of the polynomials rows at the positions x, both flat
+    return evaluate_polynomials(coefficients[rows], np.asarray(x)[:, None])[:, 0]
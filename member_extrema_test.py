@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from member_extrema import (
+    evaluate_polynomials,
+    get_adaptive_samples,
+    get_extrema,
+    get_roots_in_unit_interval,
+)
+
+
+class TestMemberExtrema(unittest.TestCase):
+
+    def test_roots_of_mixed_degrees(self):
+        coefficients = np.array(
+            [
+                # (x - 0.25) (x - 0.5) (x - 2)
+                [-0.25, 1.625, -2.75, 1],
+                # 2 (x - 0.75)
+                [-1.5, 2, 0, 0],
+                # Constant
+                [1, 0, 0, 0],
+            ]
+        )
+
+        roots = get_roots_in_unit_interval(coefficients)
+
+        assert_allclose(np.sort(roots[0])[:2], [0.25, 0.5])
+        self.assertTrue(np.isnan(np.sort(roots[0])[2]))
+        assert_allclose(np.sort(roots[1])[0], 0.75)
+        self.assertTrue(np.all(np.isnan(roots[2])))
+
+    def test_extrema(self):
+        # x (1 - x), x^3 - x and a line
+        coefficients = np.array([[0, 1, -1, 0], [0, -1, 0, 1], [1, -2, 0, 0]])
+
+        extrema = get_extrema(coefficients)
+
+        assert_allclose(extrema["max"], [0.25, 0, 1])
+        assert_allclose(extrema["max_position"], [0.5, 0, 0])
+        assert_allclose(extrema["min"], [0, -2 / 3 / np.sqrt(3), -1])
+        assert_allclose(extrema["min_position"], [0, 1 / np.sqrt(3), 1])
+
+    def test_evaluate_polynomials(self):
+        coefficients = np.array([[1, 2, 3], [0, 0, 1]])
+        x = np.array([[0, 1], [2, 3]])
+
+        assert_allclose(evaluate_polynomials(coefficients, x), [[1, 6], [4, 9]])
+
+    def test_adaptive_samples(self):
+        # A line, a parabola and a quartic
+        coefficients = np.array(
+            [[1, 2, 0, 0, 0], [0, 4, -4, 0, 0], [0, 1, 0, -2, 1]], dtype=float
+        )
+
+        offsets, x = get_adaptive_samples(coefficients, tolerance=1e-3)
+
+        self.assertEqual(offsets[1] - offsets[0], 2)
+
+        dense = np.linspace(0, 1, 1001)
+
+        for j in range(3):
+            x_j = x[offsets[j] : offsets[j + 1]]
+
+            self.assertEqual(x_j[0], 0)
+            self.assertEqual(x_j[-1], 1)
+            self.assertTrue(np.all(np.diff(x_j) > 0))
+
+            values = evaluate_polynomials(coefficients[j : j + 1], x_j[None])[0]
+            exact = evaluate_polynomials(coefficients[j : j + 1], dense[None])[0]
+
+            self.assertLessEqual(
+                np.max(np.abs(np.interp(dense, x_j, values) - exact)), 1e-3
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
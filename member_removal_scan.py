@@ -0,0 +1,198 @@
+import numpy as np
+
+
+class MemberRemovalScan:
+
+    # Removing one element changes K by -k_e on at most six DoFs, so every
+    # scenario is a rank 6 downdate of the factorization of the complete system
+    # (Sherman-Morrison-Woodbury identity). DoFs which are only connected to
+    # the removed element are decoupled instead of being left without
+    # stiffness, a singular capacitance matrix means the remaining system is
+    # kinematic.
+
+    MAX_CONDITION_NUMBER = 1e10
+
+    def __init__(self, solver, chunk_size=256):
+        # The downdates are built from the element indices, constraints with
+        # factors or several terms are not supported
+        if not solver.is_selection():
+            raise ConstraintsAreNotSupported()
+
+        self.solver = solver
+        self.chunk_size = chunk_size
+
+    def get_nelements(self):
+        return len(self.solver.static_system.get_elements())
+
+    def get_element_positions(self):
+        # Positions of the element DoFs in the non restrained system, -1 for
+        # restrained DoFs
+        indices = self.solver.get_non_restrained_indices()
+
+        positions = np.full(self.solver.get_ndofs(), -1)
+        positions[indices] = np.arange(len(indices))
+
+        return positions[self.solver.get_element_indices()]
+
+    def get_downdates(self, element_ids):
+        all_positions = self.get_element_positions()
+
+        # Number of elements connected to each position
+        connected = np.zeros(len(self.solver.get_non_restrained_indices()) + 1, int)
+        for positions in all_positions:
+            connected[np.unique(positions[positions >= 0])] += 1
+
+        k = self.solver.get_k_global_of_elements()
+        f = self.solver.get_force_vectors_of_elements()
+
+        # The DoFs of an element are collected in six slots, local DoFs which
+        # share a position share a slot, restrained DoFs go to a 7th slot
+        indices = np.full((len(element_ids), 6), -1)
+        d = np.zeros((len(element_ids), 6, 6))
+        delta_f = np.zeros((len(element_ids), 6))
+
+        for j, id in enumerate(element_ids):
+            positions = all_positions[id - 1]
+            unique_positions = np.unique(positions[positions >= 0])
+            slots = np.where(
+                positions >= 0, np.searchsorted(unique_positions, positions), 6
+            )
+
+            indices[j, : len(unique_positions)] = unique_positions
+
+            delta_k = np.zeros((7, 7))
+            np.add.at(delta_k, (slots[:, None], slots[None, :]), -k[id - 1])
+
+            # The loads of the removed element are removed as well
+            delta_f_j = np.zeros(7)
+            np.add.at(delta_f_j, slots, -f[id - 1])
+
+            # DoFs without any stiffness left are decoupled, u = 0
+            dangling = np.flatnonzero(connected[unique_positions] == 1)
+            delta_k[dangling, dangling] += 1
+
+            d[j] = delta_k[:6, :6]
+            delta_f[j] = delta_f_j[:6]
+
+        return indices, d, delta_f
+
+    def get_displacements(self, element_ids):
+        u = self.solver.get_non_restrained_displacements()
+        n = len(u)
+
+        indices, d, delta_f = self.get_downdates(element_ids)
+        is_used = indices >= 0
+
+        # Columns of A^-1 for the DoFs of all elements of the batch, an extra
+        # zero row and column stand for unused slots
+        unique_indices, inverse = np.unique(indices[is_used], return_inverse=True)
+
+        rhs = np.zeros((n, len(unique_indices)))
+        rhs[unique_indices, np.arange(len(unique_indices))] = 1
+
+        columns = np.zeros((n + 1, len(unique_indices) + 1))
+        columns[:n, :-1] = self.solver.get_factorization().solve(rhs)
+
+        column_indices = np.full(indices.shape, len(unique_indices))
+        column_indices[is_used] = inverse
+        row_indices = np.where(is_used, indices, n)
+
+        z = np.moveaxis(columns[:n, column_indices], 0, 1)
+        z_s = columns[row_indices[:, :, None], column_indices[:, None, :]]
+
+        y = u[None, :] + np.einsum("bnj,bj->bn", z, delta_f)
+        y_s = np.take_along_axis(np.pad(y, ((0, 0), (0, 1))), row_indices, axis=1)
+
+        capacitance = np.eye(6) + d @ z_s
+        is_kinematic = ~(np.linalg.cond(capacitance) < self.MAX_CONDITION_NUMBER)
+        capacitance[is_kinematic] = np.eye(6)
+
+        x = np.linalg.solve(capacitance, np.einsum("bij,bj->bi", d, y_s)[..., None])
+
+        displacements = y - np.einsum("bnj,bj->bn", z, x[..., 0])
+        displacements[is_kinematic] = np.nan
+
+        return displacements, is_kinematic
+
+    def get_internal_forces(self, displacements):
+        indices = self.solver.get_non_restrained_indices()
+
+        u = np.zeros((self.solver.get_ndofs(), len(displacements)))
+        u[indices] = displacements.T
+        u = np.moveaxis(self.solver.gather(u), -1, 0)
+
+        s = np.einsum(
+            "eij,bej->bei",
+            self.solver.get_tau_of_elements(),
+            np.einsum("eij,bej->bei", self.solver.get_k_global_of_elements(), u)
+            - self.solver.get_element_force_vectors_of_elements()[None],
+        )
+
+        s[:, :, 0:3] = -s[:, :, 0:3]
+        return s
+
+    def get_utilisations(self, internal_forces, resistances):
+        # Largest ratio of |N|, |V| and |M| at both ends to the resistances
+        forces = np.abs(internal_forces).reshape(*internal_forces.shape[:-1], 2, 3)
+
+        return np.max(forces / resistances[:, None, :], axis=(-2, -1))
+
+    def get_default_resistances(self, base_internal_forces):
+        # Without resistances the utilisation is relative to the largest
+        # forces of the complete system
+        maximum = np.max(np.abs(base_internal_forces).reshape(-1, 3), axis=0)
+        maximum[maximum == 0] = 1
+
+        return np.broadcast_to(maximum, (self.get_nelements(), 3))
+
+    def scan(self, resistances=None):
+        u = self.solver.get_non_restrained_displacements()
+        base_internal_forces = self.get_internal_forces(u[None, :])[0]
+
+        if resistances is None:
+            resistances = self.get_default_resistances(base_internal_forces)
+
+        resistances = np.asarray(resistances, dtype=float)
+        base_utilisations = self.get_utilisations(base_internal_forces, resistances)
+
+        nelements = self.get_nelements()
+        is_kinematic = np.zeros(nelements, dtype=bool)
+        max_utilisation_change = np.full(nelements, np.inf)
+        critical_element = np.zeros(nelements, dtype=int)
+        max_displacement_change = np.full(nelements, np.inf)
+
+        for start in range(0, nelements, self.chunk_size):
+            element_ids = np.arange(start, min(start + self.chunk_size, nelements)) + 1
+            rows = np.arange(len(element_ids))
+
+            displacements, kinematic = self.get_displacements(element_ids)
+            internal_forces = self.get_internal_forces(displacements)
+
+            change = (
+                self.get_utilisations(internal_forces, resistances) - base_utilisations
+            )
+
+            # The removed element itself is not rated
+            change[rows, element_ids - 1] = -np.inf
+
+            stable = ~kinematic
+            ids = element_ids[stable]
+
+            is_kinematic[element_ids - 1] = kinematic
+            critical_element[ids - 1] = np.argmax(change[stable], axis=1) + 1
+            max_utilisation_change[ids - 1] = np.max(change[stable], axis=1)
+            max_displacement_change[ids - 1] = np.max(
+                np.abs(displacements[stable] - u), axis=1, initial=0
+            )
+
+        return {
+            "element": np.arange(1, nelements + 1),
+            "kinematic": is_kinematic,
+            "max_utilisation_change": max_utilisation_change,
+            "critical_element": critical_element,
+            "max_displacement_change": max_displacement_change,
+        }
+
+
+class ConstraintsAreNotSupported(Exception):
+    pass
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from example_static_systems import create_beam_on_two_supports_with_cantilever_arm
+from member_removal_scan import MemberRemovalScan
+from static_system import StaticSystem
+from static_system_solver import StaticSystemSolver
+
+
+def create_continuous_beam(without=None):
+    # Four spans, clamped at x = 0 and pinned at x = 2 and x = 4
+    spans = [i for i in range(4) if i + 1 != without]
+    xs = sorted(set(spans) | set(i + 1 for i in spans))
+
+    node_table = [
+        dict(
+            x=x,
+            z=0,
+            restrained_x=x in (0, 2, 4),
+            restrained_z=x in (0, 2, 4),
+            restrained_phi=x == 0,
+        )
+        for x in xs
+    ]
+
+    element_table = [
+        dict(
+            node_i=xs.index(i) + 1,
+            node_k=xs.index(i + 1) + 1,
+            connection_type_i="stiff",
+            connection_type_k="stiff",
+            EA=10,
+            EI=1 + i,
+            q_x=0,
+            q_z=1 + i,
+            f_x_i=0,
+            f_z_i=0,
+            m_y_i=0,
+            f_x_k=0,
+            f_z_k=0,
+            m_y_k=0,
+        )
+        for i in spans
+    ]
+
+    return StaticSystem.from_node_and_element_tables(node_table, element_table)
+
+
+class TestMemberRemovalScan(unittest.TestCase):
+
+    def test_removals_equal_solutions_without_the_element(self):
+        solver = StaticSystemSolver(create_continuous_beam())
+        scan = MemberRemovalScan(solver)
+
+        element_ids = np.arange(1, 5)
+        displacements, is_kinematic = scan.get_displacements(element_ids)
+        internal_forces = scan.get_internal_forces(displacements)
+
+        # Without the third element the last one can rotate about x = 4
+        assert_allclose(is_kinematic, [False, False, True, False])
+
+        for id in (1, 2, 4):
+            static_system_solver = StaticSystemSolver(
+                create_continuous_beam(without=id)
+            )
+
+            for j, other_id in enumerate(i for i in element_ids if i != id):
+                assert_allclose(
+                    internal_forces[id - 1, other_id - 1],
+                    static_system_solver.get_internal_forces_of_element(j + 1),
+                    atol=1e-9,
+                )
+
+    def test_scan(self):
+        solver = StaticSystemSolver(
+            create_beam_on_two_supports_with_cantilever_arm(q_z_1=1, q_z_2=1)
+        )
+
+        table = MemberRemovalScan(solver).scan()
+
+        assert_allclose(table["element"], [1, 2])
+        assert_allclose(table["kinematic"], [True, False])
+        self.assertEqual(table["max_utilisation_change"][0], np.inf)
+        self.assertEqual(table["critical_element"][1], 1)
+        self.assertLess(table["max_utilisation_change"][1], 0)
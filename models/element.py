@@ -361,10 +361,7 @@ class Element:
         )
         x = np.linspace(0, l + scalingFactor * (u_k_local - u_i_local), n)
 
-        for i in range(0, n):
-            coords = np.array([x[i], w[i]])
-
-            x[i], w[i] = np.dot(tau, coords)
+        x, w = tau @ np.array([x, w])
 
         x += -x[0] + self.node_i.x + self.node_i.displacement_x * scalingFactor
         y = w - w[0] + self.node_i.y - self.node_i.displacement_y * scalingFactor
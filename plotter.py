@@ -27,6 +27,73 @@ from utilities import (
 from vector import vector
 
 
+def get_deformed_element_points(
+    p_i, p_k, EI, s_m_y_i, s_m_y_k, local_q_z, d, scaling_factor, n=51
+):
+    element_vector = p_k - p_i
+    l = np.linalg.norm(element_vector)
+
+    tau = get_rotation_matrix(element_vector)
+
+    u_i_local, w_i_local, _, u_k_local, w_k_local, _ = np.dot(
+        get_rotation_matrix_of_element(element_vector), d
+    )
+
+    w = -scaling_factor * get_w_displacement_curve(
+        w_i=w_i_local,
+        w_k=w_k_local,
+        m_y_i=s_m_y_i,
+        m_y_k=s_m_y_k,
+        q_z=local_q_z,
+        l=l,
+        EI=EI,
+    )(np.linspace(0, 1, n))
+
+    s = np.linspace(0, l + scaling_factor * (u_k_local - u_i_local), n)
+
+    # All points are rotated at once
+    x, w = tau @ np.array([s, w])
+
+    return (
+        x - x[0] + p_i[0] + d[0] * scaling_factor,
+        w - w[0] + p_i[1] - d[1] * scaling_factor,
+    )
+
+
+def get_point_along(x, y, t):
+    # Point at the fraction t of the length of the polyline x, y
+    lengths = np.concatenate([[0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))])
+
+    return (
+        np.interp(t * lengths[-1], lengths, x),
+        np.interp(t * lengths[-1], lengths, y),
+    )
+
+
+def get_node_values(static_system, static_system_solution, dofs):
+    # Displacements of the DoFs are their rows of T times the essential
+    # displacements. A DoF is restrained if it is a single restrained essential
+    # DoF times a factor, its reaction is the one of this DoF over the factor
+    dof_numbering = static_system.get_dof_numbering()
+    rows = dof_numbering.transformation[np.asarray(dofs) - 1]
+
+    displacements = rows @ static_system_solution.displacements
+
+    is_single = np.diff(rows.indptr) == 1
+    first = rows.indptr[:-1][is_single]
+    columns = rows.indices[first]
+
+    is_restrained = np.zeros(len(dofs), dtype=bool)
+    is_restrained[is_single] = dof_numbering.restrained_mask[columns]
+
+    reactions = np.zeros(len(dofs))
+    reactions[is_single] = (
+        np.asarray(static_system_solution.external_forces)[columns] / rows.data[first]
+    )
+
+    return displacements, is_restrained, reactions
+
+
 def plot_element(
     ax,
     element_id,
@@ -54,44 +121,30 @@ def plot_element(
     moment_joint_k=False,
     show_loads=True,
     show_element_id=True,
+    points=None,
 ):
-    element_vector = p_k - p_i
-    l = np.linalg.norm(element_vector)
-
+    # points are the coordinates x and y of the deflected element if they are
+    # sampled already, see StaticSystemSolution.get_deformed_shape
     scaling_factor = Settings.scalingFactor
-    tau = get_rotation_matrix(element_vector)
-
-    n = 51
-    x = np.linspace(0, 1, n)
 
-    u_i_local, w_i_local, _, u_k_local, w_k_local, _ = np.dot(
-        get_rotation_matrix_of_element(element_vector), [d1, d2, d3, d4, d5, d6]
-    )
-
-    w = -scaling_factor * get_w_displacement_curve(
-        w_i=w_i_local,
-        w_k=w_k_local,
-        m_y_i=s_m_y_i,
-        m_y_k=s_m_y_k,
-        q_z=local_q_z,
-        l=l,
-        EI=EI,
-    )(x)
-
-    x = np.linspace(0, l + scaling_factor * (u_k_local - u_i_local), n)
-
-    for i in range(0, n):
-        coords = np.array([x[i], w[i]])
-
-        x[i], w[i] = np.dot(tau, coords)
-
-    x += -x[0] + p_i[0] + d1 * scaling_factor
-    y = w - w[0] + p_i[1] - d2 * scaling_factor
+    if points is None:
+        x, y = get_deformed_element_points(
+            p_i=p_i,
+            p_k=p_k,
+            EI=EI,
+            s_m_y_i=s_m_y_i,
+            s_m_y_k=s_m_y_k,
+            local_q_z=local_q_z,
+            d=[d1, d2, d3, d4, d5, d6],
+            scaling_factor=scaling_factor,
+        )
+    else:
+        x, y = points
 
     if show_element_id:
         ax.annotate(
             element_id,
-            (x[n // 2], y[n // 2]),
+            get_point_along(x, y, 0.5),
             zorder=10,
             ha="center",
             va="center",
@@ -123,7 +176,10 @@ def plot_element(
             markeredgecolor="k",
             zorder=5,
         )
-    d = 1
+    # The loads are placed at 2 % of the element from its ends
+    coords_i = get_point_along(x, y, 0.02)
+    coords_k = get_point_along(x, y, 0.98)
+
     if show_loads:
         if q_z != 0:
             plot_surface_load(ax=ax, p_i=p_i, p_k=p_k)
@@ -131,13 +187,13 @@ def plot_element(
         if q_x != 0:
             plot_horizontal_surface_load(ax=ax, p_i=p_i, p_k=p_k)
 
-        plot_force(ax=ax, coords=(x[d], y[d]), value=f_x_i)
-        plot_force(ax=ax, coords=(x[d], y[d]), value=f_z_i, angle=-90)
-        plot_moment(ax=ax, coords=(x[d], y[d]), value=m_y_i)
+        plot_force(ax=ax, coords=coords_i, value=f_x_i)
+        plot_force(ax=ax, coords=coords_i, value=f_z_i, angle=-90)
+        plot_moment(ax=ax, coords=coords_i, value=m_y_i)
 
-        plot_force(ax=ax, coords=(x[-d - 1], y[-d - 1]), value=f_x_k)
-        plot_force(ax=ax, coords=(x[-d - 1], y[-d - 1]), value=f_z_k, angle=-90)
-        plot_moment(ax=ax, coords=(x[-d - 1], y[-d - 1]), value=m_y_k)
+        plot_force(ax=ax, coords=coords_k, value=f_x_k)
+        plot_force(ax=ax, coords=coords_k, value=f_z_k, angle=-90)
+        plot_moment(ax=ax, coords=coords_k, value=m_y_k)
 
     points = np.array([x, y]).transpose().reshape(-1, 1, 2)
     return np.concatenate([points[:-1], points[1:]], axis=1)
@@ -154,17 +210,33 @@ def plot_static_system(
     element_line_width=1,
     color_quantity=None,
     color_functions=None,
+    tolerance=1e-3,
 ):
     display_data = Display.prepare_static_system_for_display(static_system)
 
     segments = []
     color_values = []
 
-    for i, e in enumerate(static_system.get_elements()):
+    # Colours vary along the elements and need equally spaced segments, the
+    # deflected shape alone is sampled adaptively with tolerance relative to
+    # the size of the system
+    if color_functions or color_quantity is not None:
+        xs, ys = static_system_solution.get_deformed_shape(
+            n=51, scaling_factor=Settings.scalingFactor
+        )
+        offsets = np.arange(0, xs.size + 1, 51)
+        xs, ys = xs.ravel(), ys.ravel()
+    else:
+        offsets, xs, ys = static_system_solution.get_adaptive_deformed_shape(
+            scaling_factor=Settings.scalingFactor, tolerance=tolerance
+        )
 
-        indices = static_system.get_essential_dof_indices(get_dofs_of_element(i + 1))
+    if color_quantity is not None:
+        color_values = static_system_solution.get_field(color_quantity, n=50).ravel()
 
-        d1, d2, d3, d4, d5, d6 = static_system_solution.displacements[indices]
+    for i, e in enumerate(static_system.get_elements()):
+
+        d1, d2, d3, d4, d5, d6 = static_system_solution.displacements_of_elements[i]
 
         n_i, v_i, s_m_y_i, n_k, v_k, s_m_y_k = static_system_solution.internal_forces[i]
 
@@ -187,11 +259,8 @@ def plot_static_system(
             else False
         )
 
-        n = 50
-        x = np.linspace(0, 1, n)
-
-        if color_functions:
-            color_values.extend(color_functions[i](x))
+        if color_functions and color_quantity is None:
+            color_values.extend(color_functions[i](np.linspace(0, 1, 50)))
 
         segs = plot_element(
             ax=ax,
@@ -220,6 +289,10 @@ def plot_static_system(
             moment_joint_k=moment_joint_k,
             show_loads=show_loads,
             show_element_id=show_element_id,
+            points=(
+                xs[offsets[i] : offsets[i + 1]],
+                ys[offsets[i] : offsets[i + 1]],
+            ),
         )
 
         segments.extend(segs)
@@ -232,7 +305,7 @@ def plot_static_system(
         norm=mpl.colors.CenteredNorm(),
     )
 
-    if color_functions:
+    if color_functions or color_quantity is not None:
         lc.set_cmap(get_color_map())
         lc.set_array(color_values)
         cbar = plt.colorbar(lc, ax=ax)
@@ -257,15 +330,15 @@ def plot_static_system(
         else:
             dof_x, dof_z, dof_phi = get_dofs_of_element(element_id)[0:3]
 
-        indices = static_system.get_essential_dof_indices([dof_x, dof_z, dof_phi])
-
-        dx, dz, _ = (
-            static_system_solution.displacements[indices] * Settings.scalingFactor
+        displacements, is_restrained, reactions = get_node_values(
+            static_system, static_system_solution, [dof_x, dof_z, dof_phi]
         )
 
+        dx, dz, _ = displacements * Settings.scalingFactor
+
         if show_joints_and_supports:
 
-            if dof_x in static_system.get_restrained_dofs():
+            if is_restrained[0]:
                 ax.plot(
                     x + dx,
                     z + dz,
@@ -275,7 +348,7 @@ def plot_static_system(
                     markersize=35,
                     zorder=3,
                 )
-            if dof_z in static_system.get_restrained_dofs():
+            if is_restrained[1]:
 
                 ax.plot(
                     x + dx,
@@ -287,7 +360,7 @@ def plot_static_system(
                     zorder=3,
                 )
 
-            if dof_phi in static_system.get_restrained_dofs():
+            if is_restrained[2]:
                 ax.scatter(
                     x + dx,
                     z + dz,
@@ -298,7 +371,7 @@ def plot_static_system(
                     marker="s",
                 )
 
-        r_f_x, r_f_z, r_m_y = static_system_solution.external_forces[indices]
+        r_f_x, r_f_z, r_m_y = reactions
 
         if show_reaction_forces:
             plot_force(ax=ax, coords=(x + dx, z + dz), value=r_f_x, color="g")
@@ -317,12 +390,18 @@ def plot_plain_static_system(
     show_element_id=True,
     show_joints_and_supports=True,
     element_line_width=1,
+    displacements_of_elements=None,
 ):
     display_data = Display.prepare_static_system_for_display(static_system)
 
     segments = []
 
     for i, e in enumerate(static_system.get_elements()):
+        if displacements_of_elements is None:
+            d1, d2, d3, d4, d5, d6 = np.zeros(6)
+        else:
+            d1, d2, d3, d4, d5, d6 = displacements_of_elements[i]
+
         moment_joint_i = (
             Display.should_place_moment_joint(
                 static_system, get_dofs_of_element(i + 1)[2]
@@ -356,12 +435,12 @@ def plot_plain_static_system(
             s_m_y_i=0,
             s_m_y_k=0,
             EI=e.EI,
-            d1=0,
-            d2=0,
-            d3=0,
-            d4=0,
-            d5=0,
-            d6=0,
+            d1=d1,
+            d2=d2,
+            d3=d3,
+            d4=d4,
+            d5=d5,
+            d6=d6,
             moment_joint_i=moment_joint_i,
             moment_joint_k=moment_joint_k,
             show_loads=show_loads,
@@ -27,14 +27,7 @@ def test_plot_system(
 
     solver = StaticSystemSolver(static_system)
 
-    solution = StaticSystemSolution(
-        displacements=solver.get_displacements(),
-        external_forces=solver.get_external_forces(),
-        internal_forces=[
-            solver.get_internal_forces_of_element(i + 1)
-            for i in range(len(static_system.get_elements()))
-        ],
-    )
+    solution = StaticSystemSolution.from_solver(solver)
 
     plot_static_system(
         ax=ax,
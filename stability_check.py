@@ -0,0 +1,164 @@
+import numpy as np
+
+from factorization import SystemIsKinematic
+
+
+class UnionFind:
+
+    def __init__(self, n):
+        self.parents = np.arange(n)
+        self.sizes = np.ones(n, dtype=int)
+
+    def find(self, i):
+        while self.parents[i] != i:
+            # Path halving
+            self.parents[i] = self.parents[self.parents[i]]
+            i = self.parents[i]
+
+        return i
+
+    def union(self, i, k):
+        i = self.find(i)
+        k = self.find(k)
+
+        if i == k:
+            return
+
+        if self.sizes[i] < self.sizes[k]:
+            i, k = k, i
+
+        self.parents[k] = i
+        self.sizes[i] += self.sizes[k]
+
+    def get_roots(self):
+        return np.array([self.find(i) for i in range(len(self.parents))], dtype=int)
+
+
+class StabilityCheck:
+
+    # Topological check of a node and element table (the input of
+    # StaticSystem.from_node_and_element_tables) without assembling any
+    # matrices. Every connected substructure needs supports in x and z, at
+    # least three support reactions and no more free DoFs than the three
+    # independent deformations of each of its elements. A system which passes
+    # can still be kinematic, e.g. because of its geometry.
+
+    def __init__(self, node_table, element_table):
+        self.node_table = node_table
+        self.element_table = element_table
+
+    def get_nodes_of_elements(self):
+        return np.array(
+            [(e["node_i"], e["node_k"]) for e in self.element_table], dtype=int
+        ).reshape(-1, 2)
+
+    def get_components(self):
+        # Component of each element, numbered from 0
+        nodes = self.get_nodes_of_elements() - 1
+        union_find = UnionFind(len(self.node_table))
+
+        for node_i, node_k in nodes:
+            union_find.union(node_i, node_k)
+
+        _, components = np.unique(
+            union_find.get_roots()[nodes[:, 0]], return_inverse=True
+        )
+
+        return components.reshape(-1)
+
+    def get_ncomponents(self):
+        return len(np.unique(self.get_components()))
+
+    def get_free_dofs_and_supports(self):
+        # Free DoFs and support reactions of every used node, the rotation of
+        # a node only exists if an element is connected stiffly, every hinged
+        # element end has a rotation of its own
+        nodes = self.get_nodes_of_elements() - 1
+
+        is_stiff = np.zeros(len(self.node_table), dtype=bool)
+        hinges = np.zeros(len(self.node_table), dtype=int)
+
+        for (node_i, node_k), e in zip(nodes, self.element_table):
+            for node, connection_type in (
+                (node_i, e["connection_type_i"]),
+                (node_k, e["connection_type_k"]),
+            ):
+                if connection_type == "stiff":
+                    is_stiff[node] = True
+                else:
+                    hinges[node] += 1
+
+        supports = np.array(
+            [
+                (n["restrained_x"], n["restrained_z"], n["restrained_phi"])
+                for n in self.node_table
+            ],
+            dtype=bool,
+        ).reshape(-1, 3)
+        supports[:, 2] &= is_stiff
+
+        free_dofs = 2 + is_stiff + hinges - supports.sum(axis=1)
+
+        return free_dofs, supports
+
+    def get_problems(self):
+        problems = []
+
+        if len(self.element_table) == 0:
+            return problems
+
+        nodes = self.get_nodes_of_elements() - 1
+        components = self.get_components()
+        free_dofs, supports = self.get_free_dofs_and_supports()
+
+        ncomponents = components.max() + 1
+
+        # Component of each used node
+        node_components = np.full(len(self.node_table), -1)
+        node_components[nodes[:, 0]] = components
+        node_components[nodes[:, 1]] = components
+        is_used = node_components >= 0
+
+        nelements = np.bincount(components, minlength=ncomponents)
+        nfree_dofs = np.bincount(
+            node_components[is_used], free_dofs[is_used], minlength=ncomponents
+        )
+        nsupports = np.stack(
+            [
+                np.bincount(
+                    node_components[is_used],
+                    supports[is_used, j],
+                    minlength=ncomponents,
+                )
+                for j in range(3)
+            ],
+            axis=1,
+        )
+
+        for c in range(ncomponents):
+            element_ids = ", ".join(
+                str(id) for id in np.flatnonzero(components == c) + 1
+            )
+            name = f"Elements {element_ids}"
+
+            if nsupports[c, 0] == 0:
+                problems.append(f"{name}: no support in x")
+            if nsupports[c, 1] == 0:
+                problems.append(f"{name}: no support in z")
+            if nsupports[c].sum() < 3:
+                problems.append(f"{name}: less than 3 support reactions")
+
+            degree = 3 * nelements[c] - int(nfree_dofs[c])
+            if degree < 0:
+                problems.append(f"{name}: {-degree} more free DoFs than deformations")
+
+        return problems
+
+    def is_kinematic(self):
+        return len(self.get_problems()) > 0
+
+    def check(self):
+        problems = self.get_problems()
+
+        if problems:
+            raise SystemIsKinematic(problems)
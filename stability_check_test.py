@@ -0,0 +1,144 @@
+import unittest
+
+from factorization import SystemIsKinematic
+from stability_check import StabilityCheck, UnionFind
+from static_system import StaticSystem
+from static_system_solver import StaticSystemSolver
+
+
+def create_node(x, restrained_x=False, restrained_z=False, restrained_phi=False):
+    return dict(
+        x=x,
+        z=0,
+        restrained_x=restrained_x,
+        restrained_z=restrained_z,
+        restrained_phi=restrained_phi,
+    )
+
+
+def create_element(
+    node_i, node_k, connection_type_i="stiff", connection_type_k="stiff"
+):
+    return dict(
+        node_i=node_i,
+        node_k=node_k,
+        connection_type_i=connection_type_i,
+        connection_type_k=connection_type_k,
+        EA=1,
+        EI=1,
+        q_x=0,
+        q_z=1,
+        f_x_i=0,
+        f_z_i=0,
+        m_y_i=0,
+        f_x_k=0,
+        f_z_k=0,
+        m_y_k=0,
+    )
+
+
+def create_beam(connection_type="stiff"):
+    # Three spans on a pinned and a roller support
+    node_table = [
+        create_node(0, restrained_x=True, restrained_z=True),
+        create_node(1),
+        create_node(2),
+        create_node(3, restrained_z=True),
+    ]
+    element_table = [
+        create_element(i, i + 1, connection_type, connection_type) for i in (1, 2, 3)
+    ]
+
+    return node_table, element_table
+
+
+class TestUnionFind(unittest.TestCase):
+
+    def test_union(self):
+        union_find = UnionFind(5)
+        union_find.union(0, 1)
+        union_find.union(3, 4)
+        union_find.union(1, 4)
+
+        roots = union_find.get_roots()
+
+        self.assertEqual(len(set(roots[[0, 1, 3, 4]])), 1)
+        self.assertNotEqual(roots[2], roots[0])
+
+
+class TestStabilityCheck(unittest.TestCase):
+
+    def test_stable_beam(self):
+        node_table, element_table = create_beam()
+
+        self.assertEqual(StabilityCheck(node_table, element_table).get_problems(), [])
+
+    def test_beam_with_hinges_only(self):
+        node_table, element_table = create_beam(connection_type="hinged")
+        check = StabilityCheck(node_table, element_table)
+
+        self.assertEqual(
+            check.get_problems(),
+            ["Elements 1, 2, 3: 2 more free DoFs than deformations"],
+        )
+
+        static_system = StaticSystem.from_node_and_element_tables(
+            node_table, element_table
+        )
+        self.assertTrue(StaticSystemSolver(static_system).is_kinematic())
+
+    def test_beam_without_horizontal_support(self):
+        node_table, element_table = create_beam()
+        node_table[0]["restrained_x"] = False
+
+        self.assertEqual(
+            StabilityCheck(node_table, element_table).get_problems(),
+            [
+                "Elements 1, 2, 3: no support in x",
+                "Elements 1, 2, 3: less than 3 support reactions",
+                "Elements 1, 2, 3: 1 more free DoFs than deformations",
+            ],
+        )
+
+    def test_disconnected_substructure(self):
+        node_table, element_table = create_beam()
+        node_table += [create_node(5), create_node(6)]
+        element_table.append(create_element(5, 6))
+
+        check = StabilityCheck(node_table, element_table)
+
+        self.assertEqual(check.get_ncomponents(), 2)
+        self.assertEqual(
+            check.get_problems(),
+            [
+                "Elements 4: no support in x",
+                "Elements 4: no support in z",
+                "Elements 4: less than 3 support reactions",
+                "Elements 4: 3 more free DoFs than deformations",
+            ],
+        )
+
+    def test_rotation_restraint_needs_a_stiff_connection(self):
+        node_table = [
+            create_node(0, restrained_x=True, restrained_z=True, restrained_phi=True),
+            create_node(1),
+        ]
+        element_table = [create_element(1, 2, connection_type_i="hinged")]
+
+        self.assertTrue(StabilityCheck(node_table, element_table).is_kinematic())
+
+        element_table[0]["connection_type_i"] = "stiff"
+
+        self.assertFalse(StabilityCheck(node_table, element_table).is_kinematic())
+
+    def test_kinematic_tables_are_rejected(self):
+        node_table, element_table = create_beam(connection_type="hinged")
+
+        with self.assertRaises(SystemIsKinematic):
+            StaticSystem.from_node_and_element_tables(
+                node_table, element_table, check_stability=True
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
 import numpy as np
+from dof_numbering import DofNumbering, NodeDofNumbering
 from element import Element
+from element_table import ElementTable
+from load_case import LoadCase
 from node import Node
+from stability_check import StabilityCheck
 from utilities import get_dofs_of_element
 from vector import vector
 
@@ -9,11 +13,36 @@ class StaticSystem:
 
     def __init__(self):
         self.elements = []
+        self.element_table = ElementTable(owner=self)
         self.restrained_dofs = set()
         self.boundary_conditions = {}
 
+        # DoF -> ((factor, master DoF), ...), u_dof = sum of factor * u_master
+        self.multipoint_constraints = {}
+
+        # Named load cases, solved in addition to the loads of the elements
+        self.load_cases = {}
+
+        # Incremented on every change, solvers use it to invalidate their caches
+        self.revision = 0
+
+        # Incremented only when elements are added or removed or the
+        # constraints change, the DoF numbering depends on it
+        self.topology_revision = 0
+        self.dof_numbering = None
+
+        # Nodes of the element ends and whether they are hinged, if they are
+        # set the DoFs are numbered by nodes instead of boundary conditions
+        self.element_nodes = None
+        self.hinged_ends = None
+
     @classmethod
-    def from_node_and_element_tables(cls, node_table, element_table):
+    def from_node_and_element_tables(
+        cls, node_table, element_table, check_stability=False, node_numbering=False
+    ):
+        if check_stability:
+            StabilityCheck(node_table, element_table).check()
+
         static_system = cls()
 
         for i, e in enumerate(element_table):
@@ -66,6 +95,18 @@ class StaticSystem:
                 m_y_k=e["m_y_k"],
             )
 
+        if node_numbering:
+            static_system.set_node_numbering(
+                element_nodes=[(e["node_i"], e["node_k"]) for e in element_table],
+                hinged_ends=[
+                    (
+                        e["connection_type_i"] != "stiff",
+                        e["connection_type_k"] != "stiff",
+                    )
+                    for e in element_table
+                ],
+            )
+
         for n in node_table:
             dofs_x = n["dofs_x"]
             if len(dofs_x) > 0:
@@ -74,10 +115,11 @@ class StaticSystem:
                 if n["restrained_x"]:
                     static_system.set_restrained_dof(dof_x)
 
-                for dof in dofs_x:
-                    static_system.set_boundary_condition(
-                        dof, times=1, is_equal_to_dof=dof_x
-                    )
+                if not node_numbering:
+                    for dof in dofs_x:
+                        static_system.set_boundary_condition(
+                            dof, times=1, is_equal_to_dof=dof_x
+                        )
 
             dofs_z = n["dofs_z"]
             if len(dofs_z) > 0:
@@ -86,10 +128,11 @@ class StaticSystem:
                 if n["restrained_z"]:
                     static_system.set_restrained_dof(dof_z)
 
-                for dof in dofs_z:
-                    static_system.set_boundary_condition(
-                        dof, times=1, is_equal_to_dof=dof_z
-                    )
+                if not node_numbering:
+                    for dof in dofs_z:
+                        static_system.set_boundary_condition(
+                            dof, times=1, is_equal_to_dof=dof_z
+                        )
 
             dofs_phi = n["dofs_phi"]
             if len(dofs_phi) > 0:
@@ -98,10 +141,11 @@ class StaticSystem:
                 if n["restrained_phi"]:
                     static_system.set_restrained_dof(dof_phi)
 
-                for dof in dofs_phi:
-                    static_system.set_boundary_condition(
-                        dof, times=1, is_equal_to_dof=dof_phi
-                    )
+                if not node_numbering:
+                    for dof in dofs_phi:
+                        static_system.set_boundary_condition(
+                            dof, times=1, is_equal_to_dof=dof_phi
+                        )
 
         return static_system
 
@@ -111,6 +155,10 @@ class StaticSystem:
     def get_element(self, id):
         return self.elements[id - 1]
 
+    def get_element_properties(self):
+        # Columns of the element table, no copies are made
+        return self.element_table.get_columns()
+
     def create_element(
         self,
         p_i,
@@ -127,6 +175,9 @@ class StaticSystem:
         q_z=0,
         at_index=None,
     ):
+        if self.has_node_numbering():
+            raise NodeNumberingDoesNotMatchTopology()
+
         e = Element(p_i=p_i, p_k=p_k, EA=EA, EI=EI)
 
         e.f_x_i = f_x_i
@@ -138,95 +189,243 @@ class StaticSystem:
         e.q_x = q_x
         e.q_z = q_z
 
+        for load_case in self.load_cases.values():
+            load_case.insert_element(
+                len(self.elements) if at_index is None else at_index
+            )
+
         if at_index is None:
+            e.attach(self.element_table, len(self.elements))
+
             self.elements.append(e)
         else:
             self.restrained_dofs = set(
                 dof for dof in self.restrained_dofs if dof <= (at_index) * 6
             ) | set(dof + 6 for dof in self.restrained_dofs if dof > (at_index) * 6)
 
+            e.attach(self.element_table, at_index)
+
             self.elements.insert(at_index, e)
+            self.renumber_element_rows()
+
+        self.revision += 1
+        self.topology_revision += 1
 
     def delete_element(self, id):
+        if self.has_node_numbering():
+            raise NodeNumberingDoesNotMatchTopology()
+
         self.restrained_dofs = set(
             dof for dof in self.restrained_dofs if dof <= (id - 1) * 6
         ) | set(dof - 6 for dof in self.restrained_dofs if dof > (id) * 6)
 
+        for load_case in self.load_cases.values():
+            load_case.delete_element(id - 1)
+
+        self.elements[id - 1].detach()
+
         del self.elements[id - 1]
+        self.renumber_element_rows()
+
+        self.revision += 1
+        self.topology_revision += 1
+
+    def renumber_element_rows(self):
+        for row, e in enumerate(self.elements):
+            e.row = row
 
     def update_element(self, id, p_i, p_k, EA, EI):
-        e = self.get_element(id=id)
+        # One revision for all values, the DoFs of the element stay the same
+        self.get_element(id=id).set_values(p_i=p_i, p_k=p_k, EA=EA, EI=EI)
+
+        self.revision += 1
+
+    def create_load_case(self, name):
+        if name in self.load_cases:
+            raise LoadCaseAlreadyExists(name)
+
+        self.load_cases[name] = LoadCase(name, nelements=len(self.elements))
+
+        self.revision += 1
+
+        return self.load_cases[name]
+
+    def delete_load_case(self, name):
+        del self.load_cases[self.get_load_case(name).name]
+
+        self.revision += 1
+
+    def get_load_case(self, name):
+        if name not in self.load_cases:
+            raise LoadCaseDoesNotExist(name)
 
-        e.p_i = p_i
-        e.p_k = p_k
-        e.EA = EA
-        e.EI = EI
+        return self.load_cases[name]
+
+    def get_load_case_names(self):
+        return list(self.load_cases.keys())
+
+    def set_element_loads(self, load_case, id, **loads):
+        if not 0 < id <= len(self.elements):
+            raise ElementDoesNotExist(id)
+
+        self.get_load_case(load_case).set_element_loads(id, **loads)
+
+        self.revision += 1
 
     def set_restrained_dof(self, dof):
-        if dof not in self.get_dofs():
+        if not 0 < dof <= 6 * len(self.elements):
             raise RestrainedDoFsMustBeSubsetOfDoFs()
 
         self.restrained_dofs.add(dof)
 
+        self.revision += 1
+        self.topology_revision += 1
+
+    def set_node_numbering(self, element_nodes, hinged_ends):
+        if (
+            self.boundary_conditions
+            or self.multipoint_constraints
+            or len(element_nodes) != len(self.elements)
+        ):
+            raise NodeNumberingDoesNotMatchTopology()
+
+        self.element_nodes = np.asarray(element_nodes, dtype=int)
+        self.hinged_ends = np.asarray(hinged_ends, dtype=bool)
+
+        self.revision += 1
+        self.topology_revision += 1
+
+    def has_node_numbering(self):
+        return self.element_nodes is not None
+
+    def get_dof_numbering(self):
+        if (
+            self.dof_numbering is None
+            or self.dof_numbering_revision != self.topology_revision
+        ):
+            if self.has_node_numbering():
+                self.dof_numbering = NodeDofNumbering(
+                    element_nodes=self.element_nodes,
+                    hinged_ends=self.hinged_ends,
+                    restrained_dofs=self.restrained_dofs,
+                )
+            else:
+                self.dof_numbering = DofNumbering(
+                    nelements=len(self.elements),
+                    restrained_dofs=self.restrained_dofs,
+                    boundary_conditions=self.boundary_conditions,
+                    multipoint_constraints=self.multipoint_constraints,
+                )
+            self.dof_numbering_revision = self.topology_revision
+
+        return self.dof_numbering
+
     def get_dofs(self):
-        return np.arange(1, 6 * len(self.elements) + 1)
+        return self.get_dof_numbering().dofs
 
     def get_restrained_dofs(self):
-        return self.restrained(self.get_dofs())
+        return self.get_dof_numbering().restrained_dofs
 
     def get_non_restrained_dofs(self):
-        return self.non_restrained(self.get_dofs())
+        return self.get_dof_numbering().non_restrained_dofs
 
     def get_essential_dofs(self):
-        return self.essential(self.get_dofs())
+        return self.get_dof_numbering().essential_dofs
 
     def get_essential_non_restrained_dofs(self):
-        return self.non_restrained(self.get_essential_dofs())
+        return self.get_dof_numbering().essential_non_restrained_dofs
 
     def get_essential_restrained_dofs(self):
-        return self.restrained(self.get_essential_dofs())
+        return self.get_dof_numbering().essential_restrained_dofs
 
     def set_boundary_condition(self, dof, times, is_equal_to_dof):
+        if self.has_node_numbering():
+            raise NodeNumberingDoesNotMatchTopology()
+
         if dof == is_equal_to_dof:
             raise BoundaryDoFsMustNotBeEqual()
 
-        if dof not in self.get_dofs() or is_equal_to_dof not in self.get_dofs():
+        ndofs = 6 * len(self.elements)
+        if not (0 < dof <= ndofs and 0 < is_equal_to_dof <= ndofs):
             raise BoundaryDoFsMustBeSubsetOfDoFs()
         self.boundary_conditions[dof] = (times, is_equal_to_dof)
+        self.multipoint_constraints.pop(dof, None)
+
+        self.revision += 1
+        self.topology_revision += 1
 
     def get_boundary_conditions(self):
         return self.boundary_conditions
 
-    def get_essential_dof_index(self, dof):
-        dofs = list(self.get_essential_dofs())
-        reduced_dof = dof if dof in dofs else self.get_boundary_conditions()[dof][1]
+    def set_multipoint_constraint(self, dof, terms):
+        if self.has_node_numbering():
+            raise NodeNumberingDoesNotMatchTopology()
+
+        terms = tuple((factor, master) for factor, master in terms)
+        ndofs = 6 * len(self.elements)
+
+        for _, master in terms:
+            if dof == master:
+                raise BoundaryDoFsMustNotBeEqual()
+
+            if not (0 < dof <= ndofs and 0 < master <= ndofs):
+                raise BoundaryDoFsMustBeSubsetOfDoFs()
+
+        self.multipoint_constraints[dof] = terms
+        self.boundary_conditions.pop(dof, None)
+
+        self.revision += 1
+        self.topology_revision += 1
+
+    def get_multipoint_constraints(self):
+        return self.multipoint_constraints
+
+    def set_inclined_support(self, dof_x, dof_z, direction):
+        # The support slides along direction, the displacement normal to it is
+        # zero, the component with the smaller share follows the other one
+        d_x, d_z = direction
+
+        if abs(d_x) >= abs(d_z):
+            self.set_multipoint_constraint(dof_z, [(d_z / d_x, dof_x)])
+        else:
+            self.set_multipoint_constraint(dof_x, [(d_x / d_z, dof_z)])
 
-        return dofs.index(reduced_dof)
+    def get_essential_dof_index(self, dof):
+        return self.get_dof_numbering().get_index(dof)
 
     def get_essential_dof_indices(self, dofs):
-        return [self.get_essential_dof_index(dof) for dof in dofs]
+        return self.get_dof_numbering().get_indices(dofs)
 
     def essential(self, dofs):
-        return np.array(
-            sorted([dof for dof in dofs if dof not in self.boundary_conditions.keys()])
+        return np.sort(
+            np.setdiff1d(
+                dofs,
+                np.fromiter(
+                    [*self.boundary_conditions, *self.multipoint_constraints], int
+                ),
+            )
         )
 
     def restrained(self, dofs):
-        return np.array(sorted([dof for dof in dofs if dof in self.restrained_dofs]))
+        return np.sort(np.intersect1d(dofs, np.fromiter(self.restrained_dofs, int)))
 
     def non_restrained(self, dofs):
-        return np.array(
-            sorted([dof for dof in dofs if dof not in self.restrained_dofs])
-        )
+        return np.sort(np.setdiff1d(dofs, np.fromiter(self.restrained_dofs, int)))
 
     def __eq__(self, other):
         return (
             np.array_equal(self.elements, other.elements)
             and self.restrained_dofs == other.restrained_dofs
             and self.boundary_conditions == other.boundary_conditions
+            and self.multipoint_constraints == other.multipoint_constraints
+            and self.load_cases == other.load_cases
         )
 
 
+class NodeNumberingDoesNotMatchTopology(Exception):
+    pass
+
+
 class RestrainedDoFsMustBeSubsetOfDoFs(Exception):
     pass
 
@@ -237,3 +436,15 @@ class BoundaryDoFsMustBeSubsetOfDoFs(Exception):
 
 class BoundaryDoFsMustNotBeEqual(Exception):
     pass
+
+
+class LoadCaseAlreadyExists(Exception):
+    pass
+
+
+class LoadCaseDoesNotExist(Exception):
+    pass
+
+
+class ElementDoesNotExist(Exception):
+    pass
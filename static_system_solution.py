@@ -1,6 +1,316 @@
+import numpy as np
+
+from member_extrema import (
+    evaluate_flat,
+    evaluate_polynomials,
+    get_adaptive_samples,
+    get_bending_moment_coefficients,
+    get_extrema,
+    get_linear_coefficients,
+    get_w_displacement_coefficients,
+)
+
+
 class StaticSystemSolution:
 
-    def __init__(self, displacements, external_forces, internal_forces) -> None:
+    # Element results are stored as arrays (elements, 6) in the order of the
+    # element ids, displacements of elements are global, all others local.
+    # Queries take element ids starting at 1, all elements if ids is None.
+
+    # Columns of the internal forces at the ends i and k
+    INTERNAL_FORCE_COLUMNS = {"n": [0, 3], "v": [1, 4], "m_y": [2, 5]}
+
+    # Curves along the members, the local deflection w included
+    QUANTITIES = ("n", "v", "m_y", "w")
+
+    def __init__(
+        self,
+        displacements,
+        external_forces,
+        internal_forces,
+        displacements_of_elements,
+        local_displacements_of_elements,
+        restrained_indices=(),
+        lengths=None,
+        local_area_loads=None,
+        bending_stiffnesses=None,
+        start_points=None,
+        directions=None,
+    ) -> None:
         self.displacements = displacements
         self.external_forces = external_forces
-        self.internal_forces = internal_forces
+        self.internal_forces = np.asarray(internal_forces, dtype=float).reshape(-1, 6)
+        self.displacements_of_elements = np.asarray(
+            displacements_of_elements, dtype=float
+        ).reshape(-1, 6)
+        self.local_displacements_of_elements = np.asarray(
+            local_displacements_of_elements, dtype=float
+        ).reshape(-1, 6)
+
+        self.restrained_indices = np.asarray(restrained_indices, dtype=int)
+        self.reactions = np.asarray(external_forces)[self.restrained_indices]
+
+        nelements = len(self.internal_forces)
+        self.lengths = (
+            np.ones(nelements) if lengths is None else np.asarray(lengths, dtype=float)
+        )
+        self.local_area_loads = (
+            np.zeros((nelements, 2))
+            if local_area_loads is None
+            else np.asarray(local_area_loads, dtype=float).reshape(-1, 2)
+        )
+
+        self.bending_stiffnesses = (
+            np.ones(nelements)
+            if bending_stiffnesses is None
+            else np.broadcast_to(
+                np.asarray(bending_stiffnesses, dtype=float), nelements
+            )
+        )
+
+        # Node i and (cosine, sine) of the elements
+        self.start_points = (
+            np.zeros((nelements, 2))
+            if start_points is None
+            else np.asarray(start_points, dtype=float).reshape(-1, 2)
+        )
+        self.directions = (
+            np.tile([1.0, 0.0], (nelements, 1))
+            if directions is None
+            else np.asarray(directions, dtype=float).reshape(-1, 2)
+        )
+
+        self.fields = {}
+
+    @classmethod
+    def from_solver(cls, solver):
+        l, cosine, sine = solver.get_geometry_of_elements()
+
+        return cls(
+            displacements=solver.get_displacements(),
+            external_forces=solver.get_external_forces(),
+            internal_forces=solver.get_internal_forces_of_elements(),
+            displacements_of_elements=solver.get_displacements_of_elements(),
+            local_displacements_of_elements=(
+                solver.get_local_displacements_of_elements()
+            ),
+            restrained_indices=solver.get_restrained_indices(),
+            lengths=l,
+            local_area_loads=solver.get_local_area_loads_of_elements(),
+            bending_stiffnesses=solver.get_element_properties()["EI"],
+            start_points=solver.get_element_properties()["p_i"],
+            directions=np.stack([cosine, sine], axis=1),
+        )
+
+    def get_nelements(self):
+        return len(self.internal_forces)
+
+    def get_element_ids(self, ids=None):
+        if ids is None:
+            return np.arange(1, self.get_nelements() + 1)
+
+        ids = np.atleast_1d(np.asarray(ids, dtype=int))
+
+        if ids.size and (ids.min() < 1 or ids.max() > self.get_nelements()):
+            raise ElementIdsDoNotExist(ids)
+
+        return ids
+
+    def get_columns(self, quantity):
+        if quantity not in self.INTERNAL_FORCE_COLUMNS:
+            raise QuantityDoesNotExist(quantity)
+
+        return self.INTERNAL_FORCE_COLUMNS[quantity]
+
+    def get_end_values(self, quantity, ids=None):
+        # Values at the ends i and k, (elements, 2)
+        ids = self.get_element_ids(ids)
+
+        return self.internal_forces[ids - 1][:, self.get_columns(quantity)]
+
+    def get_max_abs(self, quantity, ids=None):
+        # Largest absolute value along the elements and the id of its element
+        ids = self.get_element_ids(ids)
+        extrema = self.get_extrema(quantity, ids)
+        values = np.maximum(np.abs(extrema["max"]), np.abs(extrema["min"]))
+
+        j = np.argmax(values)
+        return ids[j], values[j]
+
+    def get_utilisations(self, resistances, ids=None):
+        # Largest ratio of |N|, |V| and |M| at both ends to the resistances
+        # (3,) or (elements, 3) of the elements
+        ids = self.get_element_ids(ids)
+        forces = np.abs(self.internal_forces[ids - 1]).reshape(-1, 2, 3)
+
+        resistances = np.broadcast_to(
+            np.asarray(resistances, dtype=float), (self.get_nelements(), 3)
+        )
+
+        return np.max(forces / resistances[ids - 1, None, :], axis=(1, 2))
+
+    def get_top_utilised(self, k, resistances, ids=None):
+        # Ids and utilisations of the k most utilised elements, descending
+        ids = self.get_element_ids(ids)
+        utilisations = self.get_utilisations(resistances, ids)
+
+        k = min(k, len(ids))
+        if k == 0:
+            return ids[:0], utilisations[:0]
+
+        top = np.argpartition(-utilisations, k - 1)[:k]
+        top = top[np.argsort(-utilisations[top], kind="stable")]
+
+        return ids[top], utilisations[top]
+
+    def get_results_of_elements(self, ids):
+        ids = self.get_element_ids(ids)
+
+        return {
+            "element": ids,
+            "internal_forces": self.internal_forces[ids - 1],
+            "displacements": self.displacements_of_elements[ids - 1],
+            "local_displacements": self.local_displacements_of_elements[ids - 1],
+        }
+
+    def get_coefficients(self, quantity, ids=None):
+        # Polynomials of the curves in x = 0 ... 1, see member_extrema
+        if quantity not in self.QUANTITIES:
+            raise QuantityDoesNotExist(quantity)
+
+        ids = self.get_element_ids(ids)
+
+        if quantity == "w":
+            _, w_i, _, _, w_k, _ = self.local_displacements_of_elements[ids - 1].T
+            m_y_i, m_y_k = self.get_end_values("m_y", ids).T
+
+            return get_w_displacement_coefficients(
+                w_i=w_i,
+                w_k=w_k,
+                m_y_i=m_y_i,
+                m_y_k=m_y_k,
+                q_z=self.local_area_loads[ids - 1, 1],
+                l=self.lengths[ids - 1],
+                EI=self.bending_stiffnesses[ids - 1],
+            )
+
+        value_i, value_k = self.get_end_values(quantity, ids).T
+
+        if quantity == "m_y":
+            return get_bending_moment_coefficients(
+                m_y_i=value_i,
+                m_y_k=value_k,
+                q_z=self.local_area_loads[ids - 1, 1],
+                l=self.lengths[ids - 1],
+            )
+
+        return get_linear_coefficients(value_i, value_k)
+
+    def get_extrema(self, quantity, ids=None):
+        # Largest and smallest values along the elements and their positions
+        # x = 0 ... 1, without sampling
+        return get_extrema(self.get_coefficients(quantity, ids))
+
+    def get_field(self, quantity, n=11, ids=None):
+        # Values at n equally spaced points along the elements, (elements, n),
+        # sampled on the first request
+        if (quantity, n) not in self.fields:
+            self.fields[(quantity, n)] = self.sample_field(quantity, n)
+
+        return self.fields[(quantity, n)][self.get_element_ids(ids) - 1]
+
+    def sample_field(self, quantity, n):
+        coefficients = self.get_coefficients(quantity)
+        x = np.broadcast_to(np.linspace(0, 1, n), (len(coefficients), n))
+
+        return evaluate_polynomials(coefficients, x)
+
+    def get_scale(self, quantity):
+        # Largest absolute value of a quantity along all elements, 1 if zero
+        extrema = self.get_extrema(quantity)
+
+        return np.max(np.abs([extrema["max"], extrema["min"]]), initial=0) or 1
+
+    def get_size(self):
+        # Larger side of the bounding box of all elements, 1 if zero
+        end_points = self.start_points + self.lengths[:, None] * self.directions
+        points = np.concatenate([self.start_points, end_points])
+
+        return np.max(np.ptp(points, axis=0), initial=0) or 1
+
+    def get_adaptive_field(self, quantity, tolerance=1e-3, ids=None):
+        # Positions x and values of a quantity at as few points as possible,
+        # the points of the j-th element are [offsets[j]:offsets[j + 1]].
+        # tolerance is relative to the largest absolute value of the quantity.
+        ids = self.get_element_ids(ids)
+        coefficients = self.get_coefficients(quantity, ids)
+
+        offsets, x = get_adaptive_samples(
+            coefficients, tolerance * self.get_scale(quantity)
+        )
+        rows = np.repeat(np.arange(len(ids)), np.diff(offsets))
+
+        return offsets, x, evaluate_flat(coefficients, rows, x)
+
+    def get_deformed_points(self, ids, x, scaling_factor=1):
+        # Global coordinates of the deflected elements ids at the positions x,
+        # the local deflection w is scaled and rotated like in
+        # plotter.plot_element
+        ids = np.asarray(ids, dtype=int)
+        x = np.asarray(x, dtype=float)
+        j = ids - 1
+
+        u_i, _, _, u_k, _, _ = np.moveaxis(
+            self.local_displacements_of_elements[j], -1, 0
+        )
+        d_x, d_z = np.moveaxis(self.displacements_of_elements[j, 0:2], -1, 0)
+        p_x, p_y = np.moveaxis(self.start_points[j], -1, 0)
+        cosine, sine = np.moveaxis(self.directions[j], -1, 0)
+
+        coefficients = self.get_coefficients("w")[j.ravel()]
+        w = -scaling_factor * evaluate_flat(coefficients, slice(None), x.ravel())
+        w = w.reshape(x.shape)
+        w_i = -scaling_factor * coefficients[:, 0].reshape(x.shape)
+
+        s = x * (self.lengths[j] + scaling_factor * (u_k - u_i))
+
+        return (
+            cosine * s - sine * (w - w_i) + p_x + scaling_factor * d_x,
+            sine * s + cosine * (w - w_i) + p_y - scaling_factor * d_z,
+        )
+
+    def get_deformed_shape(self, n=51, scaling_factor=1, ids=None):
+        # Global coordinates x and y (elements, n) at n equally spaced points
+        ids = self.get_element_ids(ids)
+        x = np.broadcast_to(np.linspace(0, 1, n), (len(ids), n))
+
+        return self.get_deformed_points(
+            np.broadcast_to(ids[:, None], x.shape), x, scaling_factor
+        )
+
+    def get_adaptive_deformed_shape(self, scaling_factor=1, tolerance=1e-3, ids=None):
+        # Global coordinates x and y of the deflected elements at as few
+        # points as possible, the points of the j-th element are
+        # [offsets[j]:offsets[j + 1]]. tolerance is relative to the size of
+        # the system.
+        ids = self.get_element_ids(ids)
+
+        offsets, x = get_adaptive_samples(
+            scaling_factor * self.get_coefficients("w", ids),
+            tolerance * self.get_size(),
+        )
+
+        return (
+            offsets,
+            *self.get_deformed_points(
+                np.repeat(ids, np.diff(offsets)), x, scaling_factor
+            ),
+        )
+
+
+class QuantityDoesNotExist(Exception):
+    pass
+
+
+class ElementIdsDoNotExist(Exception):
+    pass
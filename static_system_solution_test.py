@@ -0,0 +1,182 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal, assert_allclose
+
+from example_static_systems import (
+    create_beam_on_two_supports_with_cantilever_arm,
+    create_bernoulli_beam_with_area_load,
+    create_frame,
+)
+from plotter import get_deformed_element_points, get_node_values
+from static_system_solution import (
+    ElementIdsDoNotExist,
+    QuantityDoesNotExist,
+    StaticSystemSolution,
+)
+from static_system_solver import StaticSystemSolver
+
+
+class TestStaticSystemSolution(unittest.TestCase):
+
+    def setUp(self):
+        self.solver = StaticSystemSolver(
+            create_beam_on_two_supports_with_cantilever_arm(q_z_1=2, q_z_2=1)
+        )
+        self.solution = StaticSystemSolution.from_solver(self.solver)
+
+    def test_reactions(self):
+        indices = self.solver.get_restrained_indices()
+
+        assert_array_equal(
+            self.solution.reactions, self.solver.get_external_forces()[indices]
+        )
+
+    def test_max_abs(self):
+        id, value = self.solution.get_max_abs("m_y")
+
+        assert_allclose(value, np.max(np.abs(self.solution.get_field("m_y", n=1001))))
+        self.assertIn(id, (1, 2))
+
+        id, value = self.solution.get_max_abs("v", ids=[2])
+
+        self.assertEqual(id, 2)
+        self.assertEqual(
+            value, np.max(np.abs(self.solution.internal_forces[1, [1, 4]]))
+        )
+
+    def test_top_utilised(self):
+        resistances = [1, 1, 2]
+        utilisations = self.solution.get_utilisations(resistances)
+
+        ids, top = self.solution.get_top_utilised(2, resistances)
+
+        assert_array_equal(ids, np.argsort(-utilisations)[:2] + 1)
+        assert_array_equal(top, np.sort(utilisations)[::-1][:2])
+
+    def test_results_of_elements(self):
+        results = self.solution.get_results_of_elements([2, 1])
+
+        assert_array_equal(results["element"], [2, 1])
+        assert_array_equal(
+            results["internal_forces"],
+            [
+                self.solver.get_internal_forces_of_element(2),
+                self.solver.get_internal_forces_of_element(1),
+            ],
+        )
+
+    def test_field(self):
+        field = self.solution.get_field("m_y", n=5)
+
+        self.assertEqual(field.shape, (2, 5))
+        assert_allclose(
+            field[:, [0, -1]], self.solution.get_end_values("m_y"), atol=1e-12
+        )
+        self.assertIs(self.solution.get_field("m_y", n=5).base, field.base)
+
+        # Midspan of a beam with q_z: M = (M_i + M_k) / 2 + q_z l^2 / 8
+        m_i, m_k = self.solution.get_end_values("m_y", ids=1)[0]
+        assert_allclose(field[0, 2], (m_i + m_k) / 2 + 2 * 2**2 / 8)
+
+    def test_extrema_match_dense_sampling(self):
+        for quantity in StaticSystemSolution.QUANTITIES:
+            extrema = self.solution.get_extrema(quantity)
+            field = self.solution.get_field(quantity, n=2001)
+            x = np.linspace(0, 1, 2001)
+
+            assert_allclose(extrema["max"], field.max(axis=1), atol=1e-6)
+            assert_allclose(extrema["min"], field.min(axis=1), atol=1e-6)
+            assert_allclose(extrema["max_position"], x[field.argmax(axis=1)], atol=1e-3)
+
+    def test_extrema_of_beam_with_area_load(self):
+        solution = StaticSystemSolution.from_solver(
+            StaticSystemSolver(create_bernoulli_beam_with_area_load(q_z=1))
+        )
+
+        m = solution.get_extrema("m_y")
+        w = solution.get_extrema("w")
+
+        assert_allclose(m["max"], [1 / 8])
+        assert_allclose(m["max_position"], [0.5])
+        assert_allclose(np.abs([w["max"], w["min"]]).max(), 5 / 384)
+
+    def test_deformed_shape_matches_plotted_elements(self):
+        static_system = create_frame(f_x=2, f_z=3)
+        solution = StaticSystemSolution.from_solver(StaticSystemSolver(static_system))
+
+        x, y = solution.get_deformed_shape(n=21, scaling_factor=2)
+
+        self.assertEqual(x.shape, (3, 21))
+
+        for i, e in enumerate(static_system.get_elements()):
+            points = get_deformed_element_points(
+                p_i=e.p_i,
+                p_k=e.p_k,
+                EI=e.EI,
+                s_m_y_i=solution.internal_forces[i, 2],
+                s_m_y_k=solution.internal_forces[i, 5],
+                local_q_z=e.get_local_area_loads()[1],
+                d=solution.displacements_of_elements[i],
+                scaling_factor=2,
+                n=21,
+            )
+
+            assert_allclose([x[i], y[i]], points, atol=1e-12)
+
+    def test_node_values_with_multipoint_constraint(self):
+        static_system = create_frame()
+        static_system.set_multipoint_constraint(dof=15, terms=[(0.5, 6), (0.5, 12)])
+
+        solver = StaticSystemSolver(static_system)
+        solution = StaticSystemSolution.from_solver(solver)
+
+        displacements, is_restrained, _ = get_node_values(
+            static_system, solution, [13, 14, 15]
+        )
+        assert_allclose(displacements, solution.displacements_of_elements[2, 0:3])
+        assert_array_equal(is_restrained, False)
+
+        _, is_restrained, reactions = get_node_values(
+            static_system, solution, [1, 2, 3]
+        )
+        indices = static_system.get_essential_dof_indices([1, 2, 3])
+        assert_array_equal(
+            is_restrained,
+            [dof in static_system.get_restrained_dofs() for dof in (1, 2, 3)],
+        )
+        assert_array_equal(reactions, solution.external_forces[indices])
+
+    def test_adaptive_field(self):
+        offsets, x, values = self.solution.get_adaptive_field("n")
+
+        assert_array_equal(offsets, [0, 2, 4])
+        assert_allclose(values.reshape(2, 2), self.solution.get_end_values("n"))
+
+        offsets, x, values = self.solution.get_adaptive_field("m_y", tolerance=1e-2)
+
+        self.assertGreater(offsets[1] - offsets[0], 2)
+        assert_allclose(
+            values[offsets[1:] - 1],
+            self.solution.get_end_values("m_y")[:, 1],
+            atol=1e-12,
+        )
+
+    def test_adaptive_deformed_shape(self):
+        offsets, x, y = self.solution.get_adaptive_deformed_shape(scaling_factor=10)
+        uniform_x, uniform_y = self.solution.get_deformed_shape(scaling_factor=10)
+
+        self.assertEqual(len(offsets), 3)
+        assert_allclose(x[offsets[:-1]], uniform_x[:, 0])
+        assert_allclose(y[offsets[1:] - 1], uniform_y[:, -1], atol=1e-12)
+
+    def test_unknown_quantity_and_ids(self):
+        with self.assertRaises(QuantityDoesNotExist):
+            self.solution.get_max_abs("m_z")
+
+        with self.assertRaises(ElementIdsDoNotExist):
+            self.solution.get_results_of_elements([3])
+
+
+if __name__ == "__main__":
+    unittest.main()
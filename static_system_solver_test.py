@@ -21,15 +21,25 @@ from models.response_variable import (
     ResponseVariableDisplacement,
     ResponseVariableInternalForce,
 )
+from factorization import Factorization, UpdatedFactorization
 from static_system_solver import StaticSystemSolver
 
 from numpy.testing import assert_array_equal, assert_allclose
+from scipy.linalg import block_diag
+from scipy.sparse import issparse
 
 from static_system import StaticSystem
 from static_system_test import create_bernoulli_beam
-from utilities import get_derived_k_global_of_element, get_k
+from utilities import (
+    get_derived_k_global_of_element,
+    get_dofs_of_element,
+    get_k,
+    get_k_global_of_element,
+)
 from vector import vector
 
+PARAMETER_INDICES = {p.value: i for i, p in enumerate(DesignParameterElement)}
+
 
 def assert_size_of_k_equal_essential_ndofs(static_system, essential_ndof):
     solver = StaticSystemSolver(static_system)
@@ -84,6 +94,286 @@ class TestStaticSystemSolver(unittest.TestCase):
 
         assert_array_equal(solver.get_k(), k)
 
+    def test_get_sparse_k_of_static_system(self):
+        static_system = create_frame(EA=3, EI=5)
+        solver = StaticSystemSolver(static_system)
+
+        k = np.zeros((13, 13))
+        for id, e in enumerate(static_system.get_elements(), 1):
+            indices = static_system.get_essential_dof_indices(get_dofs_of_element(id))
+            k[np.ix_(indices, indices)] += get_k_global_of_element(e)
+
+        sparse_k = solver.get_sparse_k()
+
+        self.assertTrue(issparse(sparse_k))
+        assert_allclose(sparse_k.toarray(), k)
+        self.assertLessEqual(sparse_k.nnz, 3 * 36)
+
+    def test_results_are_cached_until_the_static_system_changes(self):
+        static_system = create_cantilever_arm(f_z_k=1)
+        solver = StaticSystemSolver(static_system)
+
+        displacements = solver.get_displacements()
+
+        self.assertIs(solver.get_displacements(), displacements)
+        self.assertIs(solver.get_factorization(), solver.get_factorization())
+        self.assertFalse(displacements.flags.writeable)
+
+        static_system.update_element(
+            id=1, p_i=vector(0, 0), p_k=vector(1, 0), EA=1, EI=2
+        )
+
+        self.assertIsNot(solver.get_displacements(), displacements)
+        assert_allclose(solver.get_displacements(), displacements / 2)
+
+    def test_low_rank_update_after_editing_an_element(self):
+        static_system = create_frame()
+        solver = StaticSystemSolver(static_system)
+        solver.get_displacements()
+
+        e = static_system.get_element(2)
+        static_system.update_element(id=2, p_i=e.p_i, p_k=e.p_k, EA=5, EI=3)
+
+        self.assertIsInstance(solver.get_factorization(), UpdatedFactorization)
+
+        fresh_solver = StaticSystemSolver(static_system)
+        assert_allclose(
+            solver.get_displacements(), fresh_solver.get_displacements(), atol=1e-12
+        )
+        assert_allclose(
+            solver.get_internal_forces_of_element(2),
+            fresh_solver.get_internal_forces_of_element(2),
+            atol=1e-12,
+        )
+        assert_allclose(
+            solver.get_adjoint_sensa(
+                id=2, response_parameter=ResponseVariableDisplacement.W_I
+            ),
+            fresh_solver.get_adjoint_sensa(
+                id=2, response_parameter=ResponseVariableDisplacement.W_I
+            ),
+            atol=1e-12,
+        )
+
+    def test_setting_element_attributes_after_solving(self):
+        static_system = create_bernoulli_beam_with_area_load(q_z=1)
+        solver = StaticSystemSolver(static_system)
+        solver.get_displacements()
+
+        e = static_system.get_element(1)
+        e.EI = 5
+        e.q_z = 3
+        e.p_k = vector(2, 0)
+
+        assert_allclose(
+            solver.get_displacements(),
+            StaticSystemSolver(static_system).get_displacements(),
+            atol=1e-12,
+        )
+
+    def test_refactorization_when_the_update_rank_is_too_large(self):
+        static_system = create_frame()
+        solver = StaticSystemSolver(static_system)
+        solver.MAX_UPDATE_RANK = 6
+        solver.get_displacements()
+
+        for id in (1, 2):
+            e = static_system.get_element(id)
+            static_system.update_element(id=id, p_i=e.p_i, p_k=e.p_k, EA=5, EI=3)
+
+        self.assertIsInstance(solver.get_factorization(), Factorization)
+        assert_allclose(
+            solver.get_displacements(),
+            StaticSystemSolver(static_system).get_displacements(),
+            atol=1e-12,
+        )
+
+        static_system.set_restrained_dof(3)
+        self.assertIsInstance(solver.get_factorization(), Factorization)
+
+    def test_kinematic_system_has_a_mechanism_mode(self):
+        # The frame without horizontal supports can move sideways
+        static_system = StaticSystem()
+        static_system.create_element(vector(0, 0), vector(0, 1), EA=1, EI=1)
+        static_system.create_element(vector(0, 1), vector(1, 1), EA=1, EI=1)
+        static_system.create_element(vector(1, 1), vector(1, 0), EA=1, EI=1)
+
+        for dof in [2, 17]:
+            static_system.set_restrained_dof(dof=dof)
+
+        for dof, master in [(7, 4), (8, 5), (9, 6), (13, 10), (14, 11), (15, 12)]:
+            static_system.set_boundary_condition(
+                dof=dof, times=1, is_equal_to_dof=master
+            )
+
+        solver = StaticSystemSolver(static_system)
+        mode = solver.get_mechanism_mode()
+
+        self.assertTrue(solver.is_kinematic())
+        assert_allclose(solver.get_k() @ mode, 0, atol=1e-8)
+        assert_allclose(mode[solver.get_element_indices()[:, [0, 3]]], 1, atol=1e-8)
+
+        static_system.set_restrained_dof(dof=1)
+
+        self.assertFalse(solver.is_kinematic())
+        self.assertIsNone(solver.get_mechanism_mode())
+
+    def test_boundary_conditions_with_factors(self):
+        static_system = create_bernoulli_beam()
+        static_system.set_boundary_condition(dof=8, times=2, is_equal_to_dof=5)
+
+        solver = StaticSystemSolver(static_system)
+
+        # u_element = T u_essential
+        transformation = np.zeros((12, 9))
+        transformation[[0, 1, 2, 3, 4, 5], [0, 1, 2, 3, 4, 5]] = 1
+        transformation[[6, 7, 8], [3, 4, 5]] = [1, 2, 1]
+        transformation[[9, 10, 11], [6, 7, 8]] = 1
+
+        k = block_diag(*solver.get_k_global_of_elements())
+
+        self.assertFalse(solver.is_selection())
+        assert_array_equal(solver.get_transformation().toarray(), transformation)
+        assert_allclose(solver.get_k(), transformation.T @ k @ transformation)
+        assert_allclose(
+            solver.gather(solver.get_displacements()).ravel(),
+            transformation @ solver.get_displacements(),
+        )
+
+    def test_multipoint_constraint(self):
+        static_system = create_bernoulli_beam()
+        static_system.set_multipoint_constraint(dof=11, terms=[(0.5, 5), (0.5, 2)])
+
+        solver = StaticSystemSolver(static_system)
+        u = solver.get_displacements_of_element(2)
+
+        self.assertEqual(solver.get_ndofs(), 8)
+        assert_allclose(u[4], 0.5 * solver.get_displacements_of_element(1)[4])
+
+        # The element forces are the adjoint of the element displacements
+        f = np.arange(12.0).reshape(2, 6)
+        assert_allclose(
+            np.sum(solver.gather(solver.get_displacements()) * f),
+            solver.get_displacements() @ solver.scatter(f),
+        )
+
+    def test_mix_k_with_multipoint_constraint(self):
+        static_system = create_frame()
+        static_system.set_multipoint_constraint(dof=15, terms=[(0.5, 6), (0.5, 12)])
+
+        solver = StaticSystemSolver(static_system)
+
+        # Dense reference K = T^T diag(k) T
+        t = solver.get_transformation().toarray()
+        k = t.T @ block_diag(*solver.get_k_global_of_elements()) @ t
+        derived_k = t[0:6].T @ solver.get_derived_k_global_of_elements("l")[0] @ t[0:6]
+        f = t.T @ solver.get_force_vectors_of_elements().ravel()
+        derived_f = t[0:6].T @ solver.get_derived_force_vectors_of_elements("l")[0]
+
+        free = np.flatnonzero(static_system.get_dof_numbering().non_restrained_mask)
+        rows = np.setdiff1d(np.arange(len(k)), free)
+
+        u = np.zeros(len(k))
+        u[free] = np.linalg.solve(k[free][:, free], f[free])
+        f_star = derived_f - derived_k @ u
+
+        assert_array_equal(solver.get_mix_row_indices(), rows)
+        assert_allclose(solver.get_mix_k(), k[rows][:, free])
+        assert_allclose(
+            solver.get_external_forces()[rows], (k @ u - f)[rows], atol=1e-12
+        )
+        assert_allclose(
+            solver.get_derived_restrained_external_forces(id=1, dx="l"),
+            -f_star[rows]
+            + k[rows][:, free] @ np.linalg.solve(k[free][:, free], f_star[free]),
+            atol=1e-9,
+        )
+
+    def test_chains_of_boundary_conditions_are_resolved(self):
+        static_system = create_bernoulli_beam()
+        static_system.set_boundary_condition(dof=10, times=1, is_equal_to_dof=7)
+
+        dof_numbering = static_system.get_dof_numbering()
+
+        self.assertEqual(dof_numbering.get_index(10), dof_numbering.get_index(4))
+
+    def test_inclined_support(self):
+        # Beam with a roller which slides along a 45 degree slope
+        static_system = StaticSystem()
+        static_system.create_element(vector(0, 0), vector(2, 0), f_x_k=1, f_z_k=1)
+
+        for dof in [1, 2]:
+            static_system.set_restrained_dof(dof=dof)
+
+        static_system.set_inclined_support(dof_x=4, dof_z=5, direction=vector(1, 1))
+
+        solver = StaticSystemSolver(static_system)
+        u = solver.get_displacements_of_element(1)
+
+        # The support reaction is normal to the slope
+        reaction = (
+            solver.get_k_global_of_elements()[0] @ u
+            - solver.get_force_vectors_of_elements()[0]
+        )
+
+        self.assertFalse(solver.is_kinematic())
+        self.assertNotEqual(u[3], 0)
+        self.assertAlmostEqual(u[3], u[4])
+        self.assertAlmostEqual(reaction[3] + reaction[4], 0)
+
+    def test_permuted_k_has_contiguous_partitions(self):
+        solver = StaticSystemSolver(create_frame())
+
+        k = solver.get_k()
+        permutation = solver.get_permutation()
+        permuted_k = solver.get_sparse_permuted_k().toarray()
+        nfree = solver.get_nfree()
+
+        non_restrained = solver.get_non_restrained_indices()
+
+        assert_array_equal(permuted_k, k[permutation][:, permutation])
+        assert_array_equal(permutation[:nfree], non_restrained)
+        assert_array_equal(
+            solver.get_non_restrained_k(), k[non_restrained][:, non_restrained]
+        )
+        assert_array_equal(
+            solver.get_mix_k(), k[solver.get_mix_row_indices()][:, non_restrained]
+        )
+
+    def test_in_element_response_vectors(self):
+        solver = StaticSystemSolver(create_frame())
+        responses = [
+            (id, response_parameter)
+            for id in (1, 2, 3)
+            for response_parameter in [
+                *ResponseVariableInternalForce,
+                ResponseVariableDisplacement.W_K,
+            ]
+        ]
+
+        assert_array_equal(
+            solver.get_in_element_response_vectors(responses),
+            [solver.get_response_vectors(*response)[1] for response in responses],
+        )
+
+    def test_element_results_of_all_elements(self):
+        solver = StaticSystemSolver(create_frame())
+
+        tau = solver.get_tau_of_elements()
+        k = solver.get_k_global_of_elements()
+        f = solver.get_element_force_vectors_of_elements()
+        u = solver.get_displacements()
+
+        for i, indices in enumerate(solver.get_element_indices()):
+            s = tau[i] @ (k[i] @ u[indices] - f[i])
+            s[0:3] = -s[0:3]
+
+            assert_array_equal(solver.get_displacements_of_elements()[i], u[indices])
+            assert_allclose(
+                solver.get_local_displacements_of_elements()[i], tau[i] @ u[indices]
+            )
+            assert_allclose(solver.get_internal_forces_of_elements()[i], s, atol=1e-12)
+
     def test_get_non_restrained_k_of_static_system(self):
         static_system = create_bernoulli_beam()
         solver = StaticSystemSolver(static_system)
@@ -306,6 +596,46 @@ class TestStaticSystemSolver(unittest.TestCase):
 
         self.assertAlmostEqual(solver.get_external_forces()[2], 13 / 32)
 
+    def test_load_cases_are_solved_together(self):
+        static_system = create_beam_on_two_supports_with_cantilever_arm(F_right=0)
+
+        static_system.create_load_case("dead load")
+        static_system.set_element_loads("dead load", id=1, q_z=1)
+        static_system.set_element_loads("dead load", id=2, q_z=1)
+        static_system.create_load_case("point load")
+        static_system.set_element_loads("point load", id=2, f_z_k=1)
+
+        solver = StaticSystemSolver(static_system)
+
+        displacements = solver.get_displacements_of_load_cases()
+        external_forces = solver.get_external_forces_of_load_cases()
+        internal_forces = solver.get_internal_forces_of_load_cases()
+
+        self.assertEqual(np.shape(displacements), (solver.get_ndofs(), 2))
+        self.assertEqual(np.shape(internal_forces), (2, 2, 6))
+
+        for i, single_static_system in enumerate(
+            [
+                create_beam_on_two_supports_with_cantilever_arm(
+                    F_right=0, q_z_1=1, q_z_2=1
+                ),
+                create_beam_on_two_supports_with_cantilever_arm(F_right=1),
+            ]
+        ):
+            single_solver = StaticSystemSolver(single_static_system)
+
+            assert_allclose(displacements[:, i], single_solver.get_displacements())
+            assert_allclose(
+                external_forces[:, i], single_solver.get_external_forces(), atol=1e-12
+            )
+
+            for id in (1, 2):
+                assert_allclose(
+                    internal_forces[i, id - 1],
+                    single_solver.get_internal_forces_of_element(id),
+                    atol=1e-12,
+                )
+
     def test_get_internal_forces_of_element(self):
         static_system = create_bernoulli_beam_with_area_load()
         solver = StaticSystemSolver(static_system)
@@ -996,32 +1326,32 @@ class TestStaticSystemSolver(unittest.TestCase):
         )
 
         # phi_i_1
-        self.assertAlmostEqual(result[1]["l"], -1 / 8)
-        self.assertAlmostEqual(result[1]["EA"], 0)
-        self.assertAlmostEqual(result[1]["EI"], 1 / 24)
-        self.assertAlmostEqual(result[1]["q_x"], 0)
-        self.assertAlmostEqual(result[1]["q_z"], -1 / 24)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["l"]], -1 / 8)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["EA"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["EI"]], 1 / 24)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["q_x"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["q_z"]], -1 / 24)
 
         result = solver.get_adjoint_sensa(
             id=1, response_parameter=ResponseVariableDisplacement.W_I
         )
 
         # w_i_1
-        self.assertAlmostEqual(result[1]["l"], 0)
-        self.assertAlmostEqual(result[1]["EA"], 0)
-        self.assertAlmostEqual(result[1]["EI"], 0)
-        self.assertAlmostEqual(result[1]["q_x"], 0)
-        self.assertAlmostEqual(result[1]["q_z"], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["l"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["EA"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["EI"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["q_x"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["q_z"]], 0)
 
         result = solver.get_adjoint_sensa(
             id=1, response_parameter=ResponseVariableDisplacement.W_K
         )
         # w_k_1
-        self.assertAlmostEqual(result[1]["l"], 0)
-        self.assertAlmostEqual(result[1]["EA"], 0)
-        self.assertAlmostEqual(result[1]["EI"], 0)
-        self.assertAlmostEqual(result[1]["q_x"], 0)
-        self.assertAlmostEqual(result[1]["q_z"], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["l"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["EA"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["EI"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["q_x"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["q_z"]], 0)
 
         static_system = create_cantilever_arm(q_z=1)
         solver = StaticSystemSolver(static_system)
@@ -1031,11 +1361,11 @@ class TestStaticSystemSolver(unittest.TestCase):
         )
 
         # w_k_1
-        self.assertAlmostEqual(result[1]["l"], 1 / 2)
-        self.assertAlmostEqual(result[1]["EA"], 0)
-        self.assertAlmostEqual(result[1]["EI"], -1 / 8)
-        self.assertAlmostEqual(result[1]["q_x"], 0)
-        self.assertAlmostEqual(result[1]["q_z"], 1 / 8)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["l"]], 1 / 2)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["EA"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["EI"]], -1 / 8)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["q_x"]], 0)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["q_z"]], 1 / 8)
 
         # Beam on two supports with cantilever arm continous load
 
@@ -1048,8 +1378,8 @@ class TestStaticSystemSolver(unittest.TestCase):
             id=2, response_parameter=ResponseVariableDisplacement.W_K
         )
         # w_k_2
-        self.assertAlmostEqual(result[1]["l"], -1 / 3)
-        self.assertAlmostEqual(result[2]["l"], 7 / 6)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["l"]], -1 / 3)
+        self.assertAlmostEqual(result[1, PARAMETER_INDICES["l"]], 7 / 6)
 
         # Beam on two supports with cantilever arm load only on left bar
 
@@ -1062,9 +1392,9 @@ class TestStaticSystemSolver(unittest.TestCase):
             id=2, response_parameter=ResponseVariableDisplacement.W_K
         )
         # w_k_2
-        self.assertAlmostEqual(result[1]["q_z"], -1 / 3)
-        self.assertAlmostEqual(result[1]["l"], -1 / 2)
-        self.assertAlmostEqual(result[2]["l"], -1 / 3)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["q_z"]], -1 / 3)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["l"]], -1 / 2)
+        self.assertAlmostEqual(result[1, PARAMETER_INDICES["l"]], -1 / 3)
 
         # Internal Forces
 
@@ -1078,8 +1408,46 @@ class TestStaticSystemSolver(unittest.TestCase):
         )
 
         # phi_i_1
-        self.assertAlmostEqual(result[1]["q_z"], -1 / 2)
-        self.assertAlmostEqual(result[1]["l"], -7 / 2)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["q_z"]], -1 / 2)
+        self.assertAlmostEqual(result[0, PARAMETER_INDICES["l"]], -7 / 2)
+
+    def test_finite_differences_verify_analytic_derivatives(self):
+        static_system = create_beam_on_two_supports_with_cantilever_arm(
+            F_right=1, q_z_1=1, q_z_2=2
+        )
+        solver = StaticSystemSolver(static_system)
+        finite_differences_solver = StaticSystemSolver(
+            static_system, finite_differences=True
+        )
+
+        for design_parameter in DesignParameterElement:
+            with self.subTest(design_parameter=design_parameter):
+                assert_allclose(
+                    solver.get_derived_displacements(id=2, dx=design_parameter.value),
+                    finite_differences_solver.get_derived_displacements(
+                        id=2, dx=design_parameter.value
+                    ),
+                    rtol=1e-5,
+                    atol=1e-5,
+                )
+
+    def test_adjoint_sensa_equal_derived_displacements(self):
+        static_system = create_frame(EA=10, EI=2)
+        solver = StaticSystemSolver(static_system)
+
+        result = solver.get_adjoint_sensa(
+            id=2, response_parameter=ResponseVariableDisplacement.W_I
+        )
+        dof_index = static_system.get_essential_dof_index(8)
+
+        self.assertEqual(np.shape(result), (3, len(DesignParameterElement)))
+
+        for i in range(3):
+            for p, j in PARAMETER_INDICES.items():
+                self.assertAlmostEqual(
+                    result[i, j],
+                    solver.get_derived_displacements(id=i + 1, dx=p)[dof_index],
+                )
 
     def test_get_direct_sensa(self):
         with self.subTest("Bernoulli beam with area load"):
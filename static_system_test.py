@@ -12,6 +12,8 @@ from node import Node
 from static_system import (
     BoundaryDoFsMustBeSubsetOfDoFs,
     BoundaryDoFsMustNotBeEqual,
+    LoadCaseAlreadyExists,
+    LoadCaseDoesNotExist,
     RestrainedDoFsMustBeSubsetOfDoFs,
     StaticSystem,
 )
@@ -210,6 +212,106 @@ class TestStaticSystem(unittest.TestCase):
                 ),
             )
 
+    def test_element_properties_are_columns_of_the_element_table(self):
+        static_system = self.create_basic_static_system()
+
+        static_system.create_element(p_i=vector(5, 0), p_k=vector(5, 2), at_index=2)
+        deleted_element = static_system.get_element(id=5)
+        static_system.delete_element(5)
+        static_system.update_element(
+            id=1, p_i=vector(0, 0), p_k=vector(0, 3), EA=7, EI=13
+        )
+
+        properties = static_system.get_element_properties()
+        elements = static_system.get_elements()
+
+        assert_array_equal(properties["p_i"], [e.p_i for e in elements])
+        assert_array_equal(properties["p_k"], [e.p_k for e in elements])
+        assert_array_equal(properties["EA"], [e.EA for e in elements])
+        assert_array_equal(properties["f_z_i"], [e.f_z_i for e in elements])
+        self.assertTrue(np.shares_memory(properties["EI"], elements[0].table.data))
+
+        self.assertEqual(
+            deleted_element, create_element(p_i=(3, 0), p_k=(4, 0), f_z_i=1)
+        )
+
+    def test_load_cases_follow_the_elements(self):
+        static_system = self.create_basic_static_system(n=3)
+
+        static_system.create_load_case("wind")
+        static_system.set_element_loads("wind", id=3, q_x=2)
+
+        static_system.create_element(p_i=vector(5, 0), p_k=vector(5, 2), at_index=1)
+        static_system.delete_element(1)
+
+        assert_array_equal(
+            static_system.get_load_case("wind").get_loads()["q_x"], vector(0, 0, 2)
+        )
+
+        with self.assertRaises(LoadCaseAlreadyExists):
+            static_system.create_load_case("wind")
+
+        static_system.delete_load_case("wind")
+
+        with self.assertRaises(LoadCaseDoesNotExist):
+            static_system.get_load_case("wind")
+
+    def test_revision_is_incremented_on_changes(self):
+        static_system = StaticSystem()
+        self.assertEqual(static_system.revision, 0)
+
+        self.create_elements(static_system, n=2)
+        self.assertEqual(static_system.revision, 2)
+
+        static_system.set_restrained_dof(1)
+        self.assertEqual(static_system.revision, 3)
+
+        static_system.set_boundary_condition(dof=7, times=1, is_equal_to_dof=4)
+        self.assertEqual(static_system.revision, 4)
+
+        static_system.update_element(
+            id=1, p_i=vector(0, 0), p_k=vector(2, 0), EA=2, EI=2
+        )
+        self.assertEqual(static_system.revision, 5)
+
+        static_system.delete_element(2)
+        self.assertEqual(static_system.revision, 6)
+
+    def test_element_attributes_increment_the_revision(self):
+        static_system = StaticSystem()
+        self.create_elements(static_system, n=1)
+        e = static_system.get_element(1)
+
+        revision = static_system.revision
+        topology_revision = static_system.topology_revision
+
+        e.q_z = 2
+        self.assertEqual(static_system.revision, revision + 1)
+        self.assertEqual(static_system.topology_revision, topology_revision)
+
+        e.p_k = vector(2, 0)
+        self.assertEqual(static_system.revision, revision + 2)
+        self.assertEqual(static_system.topology_revision, topology_revision + 1)
+
+        # Points are copies, changes have to go through the setter
+        e.p_i[0] = 1
+        assert_array_equal(e.p_i, vector(0, 0))
+        self.assertEqual(static_system.revision, revision + 2)
+
+    def test_points_are_kept_across_creating_elements(self):
+        static_system = StaticSystem()
+        self.create_elements(static_system, n=16)
+        e = static_system.get_element(1)
+
+        p_i = e.p_i
+
+        # The table is reallocated
+        self.create_elements(static_system, n=1)
+        e.p_i = vector(-1, 0)
+
+        assert_array_equal(p_i, vector(0, 0))
+        assert_array_equal(static_system.get_element(1).p_i, vector(-1, 0))
+
     def test_get_dofs(self):
         static_system = self.create_basic_static_system(n=1)
 
@@ -86,31 +86,13 @@ def get_tau_of_element(element_vector):
 
 
 def get_k(EA=1, EI=1, l=1):
-    return EA / l * np.array(
-        [
-            [1, 0, 0, -1, 0, 0],
-            [0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0],
-            [-1, 0, 0, 1, 0, 0],
-            [0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0],
-        ]
-    ) + 2 * EI / l**3 * np.array(
-        [
-            [0, 0, 0, 0, 0, 0],
-            [0, 6, -3 * l, 0, -6, -3 * l],
-            [0, -3 * l, 2 * l**2, 0, 3 * l, l**2],
-            [0, 0, 0, 0, 0, 0],
-            [0, -6, 3 * l, 0, 6, 3 * l],
-            [0, -3 * l, l**2, 0, 3 * l, 2 * l**2],
-        ]
-    )
+    return get_k_of_elements(EA=EA, EI=EI, l=l)[0]
 
 
 def get_k_global(EA, EI, l, v):
-    tau = get_rotation_matrix_of_element(v)
+    _, cosine, sine = get_geometry_of_elements(vector(0, 0), v)
 
-    return tau.T.dot(get_k(EA=EA, EI=EI, l=l)).dot(tau)
+    return get_k_global_of_elements(EA=EA, EI=EI, l=l, cosine=cosine, sine=sine)[0]
 
 
 def get_k_global_of_element(e):
@@ -122,6 +104,122 @@ def get_k_global_of_element(e):
     )
 
 
+def get_geometry_of_elements(p_i, p_k):
+    element_vectors = np.reshape(np.asarray(p_k) - np.asarray(p_i), (-1, 2))
+    l = norm(element_vectors, axis=1)
+
+    return l, element_vectors[:, 0] / l, element_vectors[:, 1] / l
+
+
+def get_axial_matrices_of_elements(n):
+    k_EA = np.zeros((n, 6, 6))
+    k_EA[:, [0, 3], [0, 3]] = 1
+    k_EA[:, [0, 3], [3, 0]] = -1
+
+    return k_EA
+
+
+def get_bending_matrices_of_elements(a, b, c):
+    # a, b and c are the factors of the entries which are constant, linear and
+    # quadratic in l, for k itself they are 1, l and l^2
+    k_EI = np.zeros((len(a), 6, 6))
+    k_EI[:, [1, 4], [1, 4]] = 6 * a[:, None]
+    k_EI[:, [1, 4], [4, 1]] = -6 * a[:, None]
+    k_EI[:, [1, 2, 1, 5], [2, 1, 5, 1]] = -3 * b[:, None]
+    k_EI[:, [2, 4, 4, 5], [4, 2, 5, 4]] = 3 * b[:, None]
+    k_EI[:, [2, 5], [2, 5]] = 2 * c[:, None]
+    k_EI[:, [2, 5], [5, 2]] = c[:, None]
+
+    return k_EI
+
+
+def get_k_of_elements(EA, EI, l):
+    EA, EI, l = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (EA, EI, l))
+    EA, EI, l = np.broadcast_arrays(EA, EI, l)
+
+    k_EA = get_axial_matrices_of_elements(len(l))
+    k_EI = get_bending_matrices_of_elements(np.ones_like(l), l, l**2)
+
+    return (EA / l)[:, None, None] * k_EA + (2 * EI / l**3)[:, None, None] * k_EI
+
+
+def get_derived_k_of_elements(EA, EI, l, dx):
+    EA, EI, l = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (EA, EI, l))
+    EA, EI, l = np.broadcast_arrays(EA, EI, l)
+
+    k_EA = get_axial_matrices_of_elements(len(l))
+    k_EI = get_bending_matrices_of_elements(np.ones_like(l), l, l**2)
+
+    if dx == "EA":
+        return (1 / l)[:, None, None] * k_EA
+    elif dx == "EI":
+        return (2 / l**3)[:, None, None] * k_EI
+    elif dx == "l":
+        derived_k_EI = get_bending_matrices_of_elements(
+            np.zeros_like(l), np.ones_like(l), 2 * l
+        )
+
+        return (
+            (-EA / l**2)[:, None, None] * k_EA
+            + (-6 * EI / l**4)[:, None, None] * k_EI
+            + (2 * EI / l**3)[:, None, None] * derived_k_EI
+        )
+    else:
+        return np.zeros((len(l), 6, 6))
+
+
+def get_rotation_matrices_of_elements(cosine, sine):
+    cosine, sine = np.broadcast_arrays(np.atleast_1d(cosine), np.atleast_1d(sine))
+
+    rotation_matrices = np.zeros((len(cosine), 6, 6))
+    rotation_matrices[:, [0, 1, 3, 4], [0, 1, 3, 4]] = cosine[:, None]
+    rotation_matrices[:, [0, 3], [1, 4]] = -sine[:, None]
+    rotation_matrices[:, [1, 4], [0, 3]] = sine[:, None]
+    rotation_matrices[:, [2, 5], [2, 5]] = 1
+
+    return rotation_matrices
+
+
+def get_k_global_of_elements(EA, EI, l, cosine, sine):
+    tau = get_rotation_matrices_of_elements(cosine=cosine, sine=sine)
+
+    return np.swapaxes(tau, 1, 2) @ get_k_of_elements(EA=EA, EI=EI, l=l) @ tau
+
+
+def get_derived_k_global_of_elements(EA, EI, l, cosine, sine, dx):
+    tau = get_rotation_matrices_of_elements(cosine=cosine, sine=sine)
+
+    derived_k = get_derived_k_of_elements(EA=EA, EI=EI, l=l, dx=dx)
+
+    return np.swapaxes(tau, 1, 2) @ derived_k @ tau
+
+
+def get_force_vectors_of_elements(
+    l,
+    f_x_i=0,
+    f_z_i=0,
+    m_y_i=0,
+    f_x_k=0,
+    f_z_k=0,
+    m_y_k=0,
+    q_x=0,
+    q_z=0,
+):
+    l = np.atleast_1d(np.asarray(l, dtype=float))
+
+    return np.stack(
+        np.broadcast_arrays(
+            f_x_i + q_x * l / 2,
+            f_z_i + q_z * l / 2,
+            m_y_i - q_z * l**2 / 12,
+            f_x_k + q_x * l / 2,
+            f_z_k + q_z * l / 2,
+            m_y_k + q_z * l**2 / 12,
+        ),
+        axis=1,
+    )
+
+
 def get_force_vector(
     l,
     f_x_i=0,
@@ -143,7 +241,57 @@ def get_force_vector(
     )
 
 
+def get_point_load_vectors(l, xi, p_x=0, p_z=0):
+    # Consistent nodal loads of a point load at x = xi * l in local coordinates,
+    # the transverse part uses the cubic Hermite shape functions
+    l, xi = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (l, xi))
+    l, xi = np.broadcast_arrays(l, xi)
+
+    return np.stack(
+        np.broadcast_arrays(
+            p_x * (1 - xi),
+            p_z * (1 - 3 * xi**2 + 2 * xi**3),
+            -p_z * l * (xi - 2 * xi**2 + xi**3),
+            p_x * xi,
+            p_z * (3 * xi**2 - 2 * xi**3),
+            p_z * l * (xi**2 - xi**3),
+        ),
+        axis=1,
+    )
+
+
+def get_derived_force_vectors_of_elements(l, q_x=0, q_z=0, dx=None):
+    l = np.atleast_1d(np.asarray(l, dtype=float))
+    zeros = np.zeros_like(l)
+
+    if dx == "q_x":
+        derived_force_vectors = (l / 2, zeros, zeros, l / 2, zeros, zeros)
+    elif dx == "q_z":
+        derived_force_vectors = (zeros, l / 2, -(l**2) / 12, zeros, l / 2, l**2 / 12)
+    elif dx == "l":
+        derived_force_vectors = (
+            q_x / 2,
+            q_z / 2,
+            -q_z * l / 6,
+            q_x / 2,
+            q_z / 2,
+            q_z * l / 6,
+        )
+    else:
+        derived_force_vectors = (zeros,) * 6
+
+    return np.stack(np.broadcast_arrays(*derived_force_vectors), axis=1)
+
+
 def get_derived_k_global_of_element(e, dx):
+    _, cosine, sine = get_geometry_of_elements(vector(0, 0), e.get_element_vector())
+
+    return get_derived_k_global_of_elements(
+        EA=e.EA, EI=e.EI, l=e.get_length(), cosine=cosine, sine=sine, dx=dx
+    )[0]
+
+
+def get_finite_difference_derived_k_global_of_element(e, dx):
     return central_difference_derivative(
         get_k_global,
         dx=dx,
@@ -159,6 +307,12 @@ def get_dofs_of_element(id):
 
 
 def get_derived_F_global_of_element(e, dx):
+    return get_derived_force_vectors_of_elements(
+        l=e.get_length(), q_x=e.q_x, q_z=e.q_z, dx=dx
+    )[0]
+
+
+def get_finite_difference_derived_F_global_of_element(e, dx):
     return central_difference_derivative(
         get_force_vector,
         dx=dx,
@@ -6,16 +6,50 @@ from numpy.testing import assert_array_equal, assert_allclose
 from element_test import create_element
 from utilities import (
     get_derived_F_global_of_element,
+    get_derived_force_vectors_of_elements,
     get_derived_k_global_of_element,
+    get_derived_k_of_elements,
+    get_finite_difference_derived_F_global_of_element,
+    get_finite_difference_derived_k_global_of_element,
+    get_force_vector,
+    get_force_vectors_of_elements,
+    get_geometry_of_elements,
     get_k,
     get_k_global,
     get_k_global_of_element,
+    get_k_global_of_elements,
+    get_k_of_elements,
+    get_point_load_vectors,
+    get_rotation_matrices_of_elements,
     get_rotation_matrix,
     get_rotation_matrix_of_element,
 )
 from vector import vector
 
 
+def get_reference_k(EA, EI, l):
+    # Element stiffness matrix written out entry by entry
+    return EA / l * np.array(
+        [
+            [1, 0, 0, -1, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [-1, 0, 0, 1, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+        ]
+    ) + 2 * EI / l**3 * np.array(
+        [
+            [0, 0, 0, 0, 0, 0],
+            [0, 6, -3 * l, 0, -6, -3 * l],
+            [0, -3 * l, 2 * l**2, 0, 3 * l, l**2],
+            [0, 0, 0, 0, 0, 0],
+            [0, -6, 3 * l, 0, 6, 3 * l],
+            [0, -3 * l, l**2, 0, 3 * l, 2 * l**2],
+        ]
+    )
+
+
 class TestUtilities(unittest.TestCase):
 
     def test_get_k(self):
@@ -223,3 +257,114 @@ class TestUtilities(unittest.TestCase):
         e = create_element()
 
         assert_array_equal(get_derived_F_global_of_element(e, dx=dx), expected_F)
+
+    def test_analytic_derivatives_equal_finite_differences(self):
+        e = create_element(p_i=vector(1, 2), p_k=vector(4, -2), EA=30, EI=7, q_z=3)
+        e.q_x = 2
+
+        for dx in ("EA", "EI", "l", "q_x", "q_z"):
+            with self.subTest(dx=dx):
+                assert_allclose(
+                    get_derived_k_global_of_element(e, dx=dx),
+                    get_finite_difference_derived_k_global_of_element(e, dx=dx),
+                    rtol=1e-6,
+                    atol=1e-6,
+                )
+                assert_allclose(
+                    get_derived_F_global_of_element(e, dx=dx),
+                    get_finite_difference_derived_F_global_of_element(e, dx=dx),
+                    rtol=1e-6,
+                    atol=1e-6,
+                )
+
+    def test_get_derived_k_of_elements(self):
+        derived_k = get_derived_k_of_elements(
+            EA=vector(1e7, 2), EI=vector(1, 3), l=vector(2, 5), dx="l"
+        )
+
+        self.assertEqual(np.shape(derived_k), (2, 6, 6))
+        self.assertEqual(derived_k[0, 0, 0], -1e7 / 4)
+        self.assertEqual(derived_k[0, 1, 1], -12 * 3 / 2**4)
+        assert_array_equal(
+            get_derived_k_of_elements(EA=1, EI=1, l=1, dx="q_z"), np.zeros((1, 6, 6))
+        )
+
+    def test_get_derived_force_vectors_of_elements(self):
+        derived_force_vectors = get_derived_force_vectors_of_elements(
+            l=vector(1, 2), q_x=vector(0, 4), q_z=vector(6, 0), dx="l"
+        )
+
+        assert_array_equal(
+            derived_force_vectors, np.array([[0, 3, -1, 0, 3, 1], [2, 0, 0, 2, 0, 0]])
+        )
+
+    def test_point_loads_integrate_to_area_loads(self):
+        l = 3
+        xi = (np.arange(2000) + 0.5) / 2000
+
+        point_load_vectors = get_point_load_vectors(l=l, xi=xi, p_x=2, p_z=5)
+
+        assert_allclose(
+            point_load_vectors.mean(axis=0) * l,
+            get_force_vector(l=l, q_x=2, q_z=5),
+            rtol=1e-6,
+        )
+
+    def test_get_geometry_of_elements(self):
+        l, cosine, sine = get_geometry_of_elements(
+            p_i=np.array([[0, 0], [1, 1]]), p_k=np.array([[3, 4], [1, 3]])
+        )
+
+        assert_allclose(l, vector(5, 2))
+        assert_allclose(cosine, vector(3 / 5, 0))
+        assert_allclose(sine, vector(4 / 5, 1))
+
+    def test_get_k_of_elements(self):
+        k = get_k_of_elements(EA=vector(1, 13), EI=vector(1, 21), l=vector(2, 7))
+
+        self.assertEqual(np.shape(k), (2, 6, 6))
+        assert_allclose(k[0], get_reference_k(EA=1, EI=1, l=2))
+        assert_allclose(k[1], get_reference_k(EA=13, EI=21, l=7))
+
+    def test_get_rotation_matrices_of_elements(self):
+        tau = get_rotation_matrices_of_elements(
+            cosine=vector(1, np.sqrt(0.5)), sine=vector(0, np.sqrt(0.5))
+        )
+
+        assert_array_equal(tau[0], np.eye(6))
+        assert_allclose(tau[1], get_rotation_matrix_of_element(vector(1, 1)))
+
+    def test_get_k_global_of_elements(self):
+        p_i = np.array([[0, 0], [1, 1], [0, 0]])
+        p_k = np.array([[3, 4], [1, 3], [-2, 1]])
+        EA = vector(1, 7, 100)
+        EI = vector(2, 3, 5)
+
+        l, cosine, sine = get_geometry_of_elements(p_i=p_i, p_k=p_k)
+        k = get_k_global_of_elements(EA=EA, EI=EI, l=l, cosine=cosine, sine=sine)
+
+        for i in range(3):
+            c, s = (p_k[i] - p_i[i]) / l[i]
+            tau = np.eye(6)
+            tau[0:2, 0:2] = tau[3:5, 3:5] = [[c, -s], [s, c]]
+
+            assert_allclose(
+                k[i],
+                tau.T @ get_reference_k(EA=EA[i], EI=EI[i], l=l[i]) @ tau,
+                atol=1e-12,
+            )
+
+    def test_get_force_vectors_of_elements(self):
+        force_vectors = get_force_vectors_of_elements(
+            l=vector(1, 2), f_z_i=vector(3, 0), q_x=vector(0, 1), q_z=vector(6, 0)
+        )
+
+        assert_array_equal(
+            force_vectors,
+            np.array(
+                [
+                    get_force_vector(l=1, f_z_i=3, q_z=6),
+                    get_force_vector(l=2, q_x=1),
+                ]
+            ),
+        )